@@ -15,7 +15,11 @@ from app.models.customer import Customer
 from app.models.invoice import Invoice, InvoiceItem
 from app.models.organization import Organization
 from app.models.user import User
-from app.services.pdf_service import InvoicePDFService
+from app.services.pdf_service import (
+    InvoicePDFService,
+    InvoicePDFSnapshot,
+    OrganizationPDFSnapshot,
+)
 from app.services.email_service import email_service
 from app.services.subscription_service import SubscriptionService
 from app.schemas.invoice import (
@@ -197,11 +201,10 @@ async def create_invoice(
                 }
 
                 # Generate PDF
-                from app.services.pdf_service import InvoicePDFService
                 pdf_service = InvoicePDFService()
-                pdf_content = pdf_service.generate_invoice_pdf(
-                    invoice=invoice_with_items, 
-                    organization=organization, 
+                pdf_content = await pdf_service.generate_invoice_pdf_async(
+                    invoice=InvoicePDFSnapshot.from_invoice(invoice_with_items), 
+                    organization=OrganizationPDFSnapshot.from_organization(organization), 
                     customer_data=customer_data
                 )
 
@@ -899,8 +902,10 @@ async def download_invoice_pdf(
 
     # Generate PDF
     pdf_service = InvoicePDFService()
-    pdf_content = pdf_service.generate_invoice_pdf(
-        invoice=invoice, organization=organization, customer_data=customer_data
+    pdf_content = await pdf_service.generate_invoice_pdf_async(
+        invoice=InvoicePDFSnapshot.from_invoice(invoice),
+        organization=OrganizationPDFSnapshot.from_organization(organization),
+        customer_data=customer_data,
     )
 
     # Return PDF response
@@ -973,8 +978,10 @@ async def send_invoice_email(
 
         # Generate PDF
         pdf_service = InvoicePDFService()
-        pdf_content = pdf_service.generate_invoice_pdf(
-            invoice=invoice, organization=organization, customer_data=customer_data
+        pdf_content = await pdf_service.generate_invoice_pdf_async(
+            invoice=InvoicePDFSnapshot.from_invoice(invoice),
+            organization=OrganizationPDFSnapshot.from_organization(organization),
+            customer_data=customer_data,
         )
 
         # Prepare invoice data for email
@@ -60,7 +60,9 @@ async def get_aging_report(
         include_paid=include_paid,
     )
 
-    return AgingReport(**report)
+    # response_model validates the dict once; building the model here would
+    # validate it, dump it and validate it again
+    return report
 
 
 @router.get("/aging/summary", response_model=list[CustomerAgingSummary])
@@ -80,7 +82,7 @@ async def get_aging_summary_by_customer(
         as_of_date=as_of_date,
     )
 
-    return [CustomerAgingSummary(**summary) for summary in customer_summaries]
+    return customer_summaries
 
 
 @router.get("/aging/overdue", response_model=list[OverdueInvoice])
@@ -102,7 +104,7 @@ async def get_overdue_invoices(
         customer_id=customer_id,
     )
 
-    return [OverdueInvoice(**invoice) for invoice in overdue_invoices]
+    return overdue_invoices
 
 
 @router.get("/aging/trends", response_model=AgingTrends)
@@ -122,7 +124,7 @@ async def get_aging_trends(
         months_back=months_back,
     )
 
-    return AgingTrends(trends=trends, months_back=months_back)
+    return {"trends": trends, "months_back": months_back}
 
 
 @router.get("/aging/metrics", response_model=dict)
@@ -161,18 +163,8 @@ async def get_aging_metrics(
     )
 
     # Calculate average days outstanding (weighted by amount)
-    total_weighted_days = 0
-    total_amount = 0
-
-    for invoice in report["invoice_details"]:
-        if invoice["outstanding_amount"] > 0:
-            total_weighted_days += invoice["days_overdue"] * float(
-                invoice["outstanding_amount"]
-            )
-            total_amount += float(invoice["outstanding_amount"])
-
-    average_days_outstanding = (
-        total_weighted_days / total_amount if total_amount > 0 else 0.0
+    average_days_outstanding = AgingReportService.average_days_outstanding(
+        report["invoice_details"]
     )
 
     # Find worst aging customer
@@ -338,7 +330,7 @@ async def get_dashboard_overview(
         date_to=date_to,
     )
 
-    return DashboardOverview(**dashboard_data)
+    return dashboard_data
 
 
 @router.get("/dashboard/kpis", response_model=KPISummary)
@@ -368,7 +360,7 @@ async def get_kpi_summary(
     customer_metrics = dashboard_data["customer_metrics"]
     invoice_metrics = dashboard_data["invoice_metrics"]
 
-    kpis = {
+    return {
         "total_revenue": revenue_metrics["total_revenue"],
         "outstanding_amount": revenue_metrics["outstanding_amount"],
         "overdue_amount": aging_metrics["total_overdue"],
@@ -379,8 +371,6 @@ async def get_kpi_summary(
         "overdue_invoices": invoice_metrics["overdue_count"],
     }
 
-    return KPISummary(**kpis)
-
 
 @router.get("/dashboard/quick-stats", response_model=QuickStats)
 async def get_quick_stats(
@@ -406,7 +396,7 @@ async def get_quick_stats(
     payment_metrics = dashboard_data["payment_metrics"]
     aging_metrics = dashboard_data["aging_metrics"]
 
-    quick_stats = {
+    return {
         "total_revenue_this_month": revenue_metrics["total_revenue"],
         "total_outstanding": revenue_metrics["outstanding_amount"],
         "overdue_amount": aging_metrics["total_overdue"],
@@ -415,8 +405,6 @@ async def get_quick_stats(
         "payments_this_month": payment_metrics["payment_count"],
     }
 
-    return QuickStats(**quick_stats)
-
 
 @router.get("/dashboard/revenue-metrics", response_model=dict)
 async def get_revenue_metrics(
@@ -10,7 +10,6 @@ from app.core.database import get_db
 from app.core.dependencies import get_current_user
 from app.models.user import User
 from app.models.subscription import (
-    SubscriptionPlan,
     Subscription,
     UsageRecord,
     PlanType,
@@ -51,10 +50,7 @@ async def get_subscription_plan(
     db: AsyncSession = Depends(get_db),
 ) -> Any:
     """Get a specific subscription plan"""
-    result = await db.execute(
-        select(SubscriptionPlan).where(SubscriptionPlan.id == plan_id)
-    )
-    plan = result.scalar_one_or_none()
+    plan = await SubscriptionService.get_plan_by_id(db, plan_id)
     
     if not plan:
         raise HTTPException(
@@ -128,10 +124,7 @@ async def create_subscription(
         )
     
     # Verify plan exists
-    result = await db.execute(
-        select(SubscriptionPlan).where(SubscriptionPlan.id == request.plan_id)
-    )
-    plan = result.scalar_one_or_none()
+    plan = await SubscriptionService.get_plan_by_id(db, request.plan_id)
     
     if not plan:
         raise HTTPException(
@@ -149,9 +142,7 @@ async def create_subscription(
         trial_days=request.trial_days,
     )
     
-    # Load plan for response
-    await db.refresh(subscription, ["plan"])
-    
+    # Plan is loaded alongside the RETURNING row
     return subscription
 
 
@@ -182,10 +173,7 @@ async def upgrade_subscription(
     
     # If changing plan, verify new plan exists
     if request.plan_id:
-        result = await db.execute(
-            select(SubscriptionPlan).where(SubscriptionPlan.id == request.plan_id)
-        )
-        new_plan = result.scalar_one_or_none()
+        new_plan = await SubscriptionService.get_plan_by_id(db, request.plan_id)
         
         if not new_plan:
             raise HTTPException(
@@ -537,10 +525,19 @@ async def initialize_paystack_payment(
     
     # Get organization details
     from app.models.organization import Organization
-    org_result = await db.execute(
-        select(Organization).where(Organization.id == current_user.organization_id)
-    )
-    organization = org_result.scalar_one()
+    organization = await db.get(Organization, current_user.organization_id)
+    
+    if not organization:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organization not found"
+        )
+    
+    if not await SubscriptionService.get_plan_by_id(db, request.plan_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Subscription plan not found"
+        )
     
     try:
         transaction_data = await SubscriptionService.initialize_paystack_payment(
@@ -73,6 +73,9 @@ async def handle_charge_success(db: AsyncSession, data: dict):
     reference = data.get("reference")
     amount = data.get("amount")  # In kobo
     
+    # The charge changed on Paystack's side, so re-verify it next time
+    PaystackService.forget_verified_transaction(reference)
+    
     if not customer_code:
         return
     
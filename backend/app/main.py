@@ -4,33 +4,39 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.api import api_router
 from app.core.config import settings
 
-app = FastAPI(
-    title="Arvalox API",
-    description="SaaS Accounts Receivable Management Platform",
-    version="1.0.0",
-    docs_url="/docs" if settings.debug else None,
-    redoc_url="/redoc" if settings.debug else None,
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    expose_headers=["*"],
-)
-
-# Include API routes
-app.include_router(api_router, prefix="/api/v1")
-
-
-@app.get("/")
-async def root():
-    return {"message": "Arvalox API", "version": "1.0.0"}
-
-
-@app.get("/health")
-async def health_check():
-    return {"status": "healthy"}
+
+def create_app() -> FastAPI:
+    """Build the API application; each instance has its own dependency overrides"""
+    app = FastAPI(
+        title="Arvalox API",
+        description="SaaS Accounts Receivable Management Platform",
+        version="1.0.0",
+        docs_url="/docs" if settings.debug else None,
+        redoc_url="/redoc" if settings.debug else None,
+    )
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=["*"],
+    )
+
+    # Include API routes
+    app.include_router(api_router, prefix="/api/v1")
+
+    @app.get("/")
+    async def root():
+        return {"message": "Arvalox API", "version": "1.0.0"}
+
+    @app.get("/health")
+    async def health_check():
+        return {"status": "healthy"}
+
+    return app
+
+
+app = create_app()
@@ -8,10 +8,13 @@ from sqlalchemy import (
     DateTime,
     Enum as SQLEnum,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
+    UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import relationship
 
@@ -85,7 +88,7 @@ class Subscription(BaseModel):
     organization_id = Column(Integer, ForeignKey("organizations.id"), nullable=False, unique=True)
     plan_id = Column(Integer, ForeignKey("subscription_plans.id"), nullable=False)
     
-    status = Column(SQLEnum(SubscriptionStatus), nullable=False, default=SubscriptionStatus.ACTIVE)
+    status = Column(SQLEnum(SubscriptionStatus), nullable=False, default=SubscriptionStatus.ACTIVE, index=True)
     billing_interval = Column(SQLEnum(BillingInterval), nullable=False, default=BillingInterval.MONTHLY)
     
     # Subscription lifecycle
@@ -116,10 +119,20 @@ class Subscription(BaseModel):
     
     # Relationships
     organization = relationship("Organization", back_populates="subscription")
-    plan = relationship("SubscriptionPlan", foreign_keys=[plan_id], back_populates="subscriptions")
-    downgrade_plan = relationship("SubscriptionPlan", foreign_keys=[downgrade_to_plan_id], post_update=True)
+    # Plans are read on nearly every access, so batch them in one IN query instead of a JOIN
+    plan = relationship("SubscriptionPlan", foreign_keys=[plan_id], back_populates="subscriptions", lazy="selectin")
+    downgrade_plan = relationship("SubscriptionPlan", foreign_keys=[downgrade_to_plan_id], post_update=True, lazy="selectin")
     usage_records = relationship("UsageRecord", back_populates="subscription", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        # Partial index backing the expiring-subscriptions lookup
+        Index(
+            "ix_subscriptions_expiry",
+            "current_period_end",
+            postgresql_where=text("status IN ('ACTIVE', 'TRIALING')"),
+        ),
+    )
+
     @property
     def is_active(self) -> bool:
         """Check if subscription is currently active"""
@@ -179,8 +192,9 @@ class Subscription(BaseModel):
         if self.trial_end:
             self.trial_end += timedelta(days=days)
         else:
-            self.trial_start = datetime.now(timezone.utc)
-            self.trial_end = datetime.now(timezone.utc) + timedelta(days=days)
+            now = datetime.now(timezone.utc)
+            self.trial_start = now
+            self.trial_end = now + timedelta(days=days)
             self.status = SubscriptionStatus.TRIALING
 
     @property
@@ -244,18 +258,18 @@ class Subscription(BaseModel):
             return True
         return False
 
-    def increment_invoice_count(self) -> None:
+    def increment_invoice_count(self, by: int = 1) -> None:
         """Increment invoice count and reset if needed"""
         self.reset_monthly_usage_if_needed()
-        self.current_invoice_count += 1
+        self.current_invoice_count += by
 
-    def increment_customer_count(self) -> None:
+    def increment_customer_count(self, by: int = 1) -> None:
         """Increment customer count (cumulative)"""
-        self.current_customer_count += 1
+        self.current_customer_count += by
 
-    def increment_team_member_count(self) -> None:
+    def increment_team_member_count(self, by: int = 1) -> None:
         """Increment team member count (cumulative)"""
-        self.current_team_member_count += 1
+        self.current_team_member_count += by
 
 
 class UsageRecord(BaseModel):
@@ -275,5 +289,8 @@ class UsageRecord(BaseModel):
     # Relationship
     subscription = relationship("Subscription", back_populates="usage_records")
 
-    class Meta:
-        unique_together = [["subscription_id", "month", "year"]]
+    __table_args__ = (
+        UniqueConstraint(
+            "subscription_id", "month", "year", name="uq_usage_record_subscription_period"
+        ),
+    )
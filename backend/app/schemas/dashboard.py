@@ -4,6 +4,8 @@ from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
+from app.schemas.aging_report import AgingSummary
+
 
 class DateRange(BaseModel):
     """Schema for date range"""
@@ -57,19 +59,15 @@ class CustomerMetrics(BaseModel):
     customers_with_outstanding: int = Field(..., ge=0)
 
 
-class AgingBucketMetrics(BaseModel):
-    """Schema for aging bucket metrics"""
-    count: int = Field(..., ge=0)
-    amount: Decimal = Field(..., decimal_places=2)
-
-
 class AgingMetrics(BaseModel):
     """Schema for aging metrics"""
     total_outstanding: Decimal = Field(..., decimal_places=2)
     total_overdue: Decimal = Field(..., decimal_places=2)
     overdue_percentage: float = Field(..., ge=0, le=100)
     collection_efficiency: float = Field(..., ge=0, le=100)
-    aging_breakdown: Dict[str, AgingBucketMetrics]
+    # Fixed buckets, so a struct rather than a dict keyed by bucket name;
+    # serializes to the same JSON object
+    aging_breakdown: AgingSummary
 
 
 class RecentActivity(BaseModel):
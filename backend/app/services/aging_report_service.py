@@ -1,3 +1,4 @@
+from bisect import bisect_left
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple
@@ -10,6 +11,31 @@ from sqlalchemy.orm import selectinload
 from app.models.customer import Customer
 from app.models.invoice import Invoice
 
+# Upper bound (inclusive) in days overdue of every bucket but the last
+_AGING_BUCKET_LIMITS = (0, 30, 60, 90)
+_AGING_BUCKETS = ("current", "days_1_30", "days_31_60", "days_61_90", "days_over_90")
+
+
+def _aging_bucket_index(days_overdue: int) -> int:
+    """Position in _AGING_BUCKETS of the bucket for days overdue"""
+    return bisect_left(_AGING_BUCKET_LIMITS, days_overdue)
+
+
+def _summarize_aging(bucket_indexes: List[int], amounts: List[Decimal]) -> Dict:
+    """Build the aging summary from parallel bucket index and amount columns"""
+    counts = [0] * len(_AGING_BUCKETS)
+    totals = [Decimal("0.00")] * len(_AGING_BUCKETS)
+    for index, amount in zip(bucket_indexes, amounts, strict=True):
+        counts[index] += 1
+        totals[index] += amount
+
+    summary = {
+        bucket: {"count": count, "amount": total}
+        for bucket, count, total in zip(_AGING_BUCKETS, counts, totals, strict=True)
+    }
+    summary["total"] = {"count": len(amounts), "amount": sum(totals, Decimal("0.00"))}
+    return summary
+
 
 class AgingReportService:
     """Service for generating accounts receivable aging reports"""
@@ -46,14 +72,9 @@ class AgingReportService:
 
         # Calculate aging for each invoice
         aging_details = []
-        aging_summary = {
-            "current": {"count": 0, "amount": Decimal("0.00")},
-            "days_1_30": {"count": 0, "amount": Decimal("0.00")},
-            "days_31_60": {"count": 0, "amount": Decimal("0.00")},
-            "days_61_90": {"count": 0, "amount": Decimal("0.00")},
-            "days_over_90": {"count": 0, "amount": Decimal("0.00")},
-            "total": {"count": 0, "amount": Decimal("0.00")},
-        }
+        # Bucket and amount columns, summed once all invoices are seen
+        bucket_indexes = []
+        amounts = []
 
         customer_summaries = {}
 
@@ -68,13 +89,12 @@ class AgingReportService:
             days_overdue = (as_of_date - invoice.due_date).days
 
             # Determine aging bucket
-            aging_bucket = self._get_aging_bucket(days_overdue)
+            bucket_index = _aging_bucket_index(days_overdue)
+            aging_bucket = _AGING_BUCKETS[bucket_index]
 
             # Add to aging summary
-            aging_summary[aging_bucket]["count"] += 1
-            aging_summary[aging_bucket]["amount"] += outstanding_amount
-            aging_summary["total"]["count"] += 1
-            aging_summary["total"]["amount"] += outstanding_amount
+            bucket_indexes.append(bucket_index)
+            amounts.append(outstanding_amount)
 
             # Customer summary
             customer_key = invoice.customer_id
@@ -135,7 +155,7 @@ class AgingReportService:
             "organization_id": organization_id,
             "customer_filter": customer_id,
             "include_paid": include_paid,
-            "summary": aging_summary,
+            "summary": _summarize_aging(bucket_indexes, amounts),
             "customer_summaries": customer_list,
             "invoice_details": aging_details,
             "total_customers": len(customer_list),
@@ -286,7 +306,30 @@ class AgingReportService:
 
         return trends
 
-    def _get_aging_bucket(self, days_overdue: int) -> str:
+    @staticmethod
+    def average_days_outstanding(invoice_details: List[Dict]) -> float:
+        """
+        Average days overdue weighted by outstanding amount
+
+        Args:
+            invoice_details: Invoice details from generate_aging_report
+
+        Returns:
+            Weighted average days, 0.0 when nothing is outstanding
+        """
+        # Sum in Decimal and convert once, not twice per invoice
+        weighted_days = Decimal("0")
+        total_amount = Decimal("0")
+        for invoice in invoice_details:
+            amount = invoice["outstanding_amount"]
+            if amount > 0:
+                weighted_days += invoice["days_overdue"] * amount
+                total_amount += amount
+
+        return float(weighted_days / total_amount) if total_amount > 0 else 0.0
+
+    @staticmethod
+    def _get_aging_bucket(days_overdue: int) -> str:
         """
         Determine aging bucket based on days overdue
 
@@ -296,16 +339,7 @@ class AgingReportService:
         Returns:
             Aging bucket name
         """
-        if days_overdue <= 0:
-            return "current"
-        elif days_overdue <= 30:
-            return "days_1_30"
-        elif days_overdue <= 60:
-            return "days_31_60"
-        elif days_overdue <= 90:
-            return "days_61_90"
-        else:
-            return "days_over_90"
+        return _AGING_BUCKETS[_aging_bucket_index(days_overdue)]
 
     async def _get_outstanding_invoices(
         self,
@@ -13,6 +13,11 @@ from app.models.payment import Payment
 from app.services.aging_report_service import AgingReportService
 
 
+def _percentage(part: Decimal, whole: Decimal) -> float:
+    """part as a percentage of a non-zero whole, in float arithmetic"""
+    return float(part) * 100 / float(whole)
+
+
 class DashboardService:
     """Service for generating dashboard metrics and KPIs"""
 
@@ -137,7 +142,7 @@ class DashboardService:
         current_revenue = revenue_row.total_revenue or Decimal('0.00')
         revenue_growth = 0.0
         if prev_revenue > 0:
-            revenue_growth = float((current_revenue - prev_revenue) / prev_revenue * 100)
+            revenue_growth = _percentage(current_revenue - prev_revenue, prev_revenue)
 
         return {
             "total_revenue": current_revenue,
@@ -325,8 +330,8 @@ class DashboardService:
             summary["days_over_90"]["amount"]
         )
         
-        overdue_percentage = float(total_overdue / total_outstanding * 100) if total_outstanding > 0 else 0.0
-        collection_efficiency = float(summary["current"]["amount"] / total_outstanding * 100) if total_outstanding > 0 else 100.0
+        overdue_percentage = _percentage(total_overdue, total_outstanding) if total_outstanding > 0 else 0.0
+        collection_efficiency = _percentage(summary["current"]["amount"], total_outstanding) if total_outstanding > 0 else 100.0
 
         return {
             "total_outstanding": total_outstanding,
@@ -1,5 +1,6 @@
 import hashlib
 import hmac
+import time
 from decimal import Decimal
 from typing import Any
 
@@ -10,6 +11,26 @@ from app.core.config import settings
 from app.models.subscription import SubscriptionPlan, BillingInterval
 
 
+# Successful verifications are final, so remember them briefly to absorb
+# double submits without another Paystack call. Only results fetched from
+# Paystack by verify_transaction are ever stored here
+_VERIFIED_TRANSACTIONS: dict[str, tuple[float, dict[str, Any]]] = {}
+_VERIFIED_TRANSACTIONS_TTL = 600  # seconds
+_VERIFIED_TRANSACTIONS_MAX = 1024
+
+
+def _remember_verified_transaction(reference: str, data: dict[str, Any]) -> None:
+    """Cache a successful transaction verification"""
+    now = time.monotonic()
+    if len(_VERIFIED_TRANSACTIONS) >= _VERIFIED_TRANSACTIONS_MAX:
+        for expired in [ref for ref, (expires_at, _) in _VERIFIED_TRANSACTIONS.items() if expires_at <= now]:
+            del _VERIFIED_TRANSACTIONS[expired]
+        if len(_VERIFIED_TRANSACTIONS) >= _VERIFIED_TRANSACTIONS_MAX:
+            # Still full, drop the oldest entry
+            del _VERIFIED_TRANSACTIONS[next(iter(_VERIFIED_TRANSACTIONS))]
+    _VERIFIED_TRANSACTIONS[reference] = (now + _VERIFIED_TRANSACTIONS_TTL, data)
+
+
 class PaystackService:
     """Service for Paystack payment integration"""
     
@@ -69,6 +90,9 @@ class PaystackService:
 
     async def verify_transaction(self, reference: str) -> dict[str, Any]:
         """Verify a Paystack transaction"""
+        cached = _VERIFIED_TRANSACTIONS.get(reference)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
         
         async with aiohttp.ClientSession() as session, session.get(
             f"{self.base_url}/transaction/verify/{reference}",
@@ -78,8 +102,19 @@ class PaystackService:
                 
                 if not result.get("status"):
                     raise Exception(f"Transaction verification failed: {result.get('message')}")
+                
+                # Pending or failed transactions can still change, so only cache successes
+                data = result["data"]
+                if data.get("status") == "success":
+                    _remember_verified_transaction(reference, data)
                     
-                return result["data"]
+                return data
+
+    @staticmethod
+    def forget_verified_transaction(reference: str | None) -> None:
+        """Drop a cached verification so the next verify call asks Paystack"""
+        if reference:
+            _VERIFIED_TRANSACTIONS.pop(reference, None)
 
     async def create_subscription_plan(
         self,
@@ -1,25 +1,232 @@
+import asyncio
 import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from datetime import date
 from decimal import Decimal
 from typing import Optional
+from xml.sax.saxutils import escape
 
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Preformatted, Spacer, Table, TableStyle
 from reportlab.platypus.flowables import HRFlowable
 
 from app.models.invoice import Invoice
 from app.models.organization import Organization
 
 
+@dataclass(slots=True, frozen=True, kw_only=True)
+class InvoiceItemSnapshot:
+    """Line item fields needed to render an invoice PDF"""
+    description: str
+    quantity: Decimal
+    unit_price: Decimal
+    line_total: Decimal
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class InvoicePDFSnapshot:
+    """Plain copy of an invoice, decoupled from the SQLAlchemy session"""
+    invoice_number: str
+    invoice_date: date
+    due_date: date
+    status: str
+    subtotal: Decimal
+    tax_amount: Decimal
+    total_amount: Decimal
+    paid_amount: Decimal
+    notes: Optional[str]
+    items: tuple[InvoiceItemSnapshot, ...]
+
+    @classmethod
+    def from_invoice(cls, invoice: Invoice) -> "InvoicePDFSnapshot":
+        """Snapshot an invoice whose items have already been loaded"""
+        return cls(
+            invoice_number=invoice.invoice_number,
+            invoice_date=invoice.invoice_date,
+            due_date=invoice.due_date,
+            status=invoice.status,
+            subtotal=invoice.subtotal,
+            tax_amount=invoice.tax_amount,
+            total_amount=invoice.total_amount,
+            paid_amount=invoice.paid_amount,
+            notes=invoice.notes,
+            items=tuple(
+                InvoiceItemSnapshot(
+                    description=item.description,
+                    quantity=item.quantity,
+                    unit_price=item.unit_price,
+                    line_total=item.line_total,
+                )
+                for item in invoice.items
+            ),
+        )
+
+
+@dataclass(slots=True, frozen=True, kw_only=True)
+class OrganizationPDFSnapshot:
+    """Organization fields shown on an invoice PDF"""
+    name: str
+    email: Optional[str] = None
+    currency_symbol: Optional[str] = None
+
+    @classmethod
+    def from_organization(cls, organization: Organization) -> "OrganizationPDFSnapshot":
+        """Snapshot an organization"""
+        return cls(
+            name=organization.name,
+            email=organization.email,
+            currency_symbol=organization.currency_symbol,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class _OrgTemplate:
+    """Header and footer text shared by every invoice of an organization"""
+    company_name: str
+    footer_text: str
+
+
+@lru_cache(maxsize=128)
+def _org_template(org_name: str, org_email: Optional[str]) -> _OrgTemplate:
+    """Get an organization's header and footer text, cached across services and requests"""
+    footer_text = f"Thank you for your business! | {org_name}"
+    if org_email:
+        footer_text += f" | {org_email}"
+    return _OrgTemplate(company_name=org_name, footer_text=footer_text)
+
+
+# Brand colors, resolved once instead of parsing hex strings per render
+_BRAND_BLUE = colors.HexColor('#3498db')
+_BRAND_DARK = colors.HexColor('#2c3e50')
+_BRAND_SLATE = colors.HexColor('#34495e')
+_BRAND_GRAY = colors.HexColor('#bdc3c7')
+_BRAND_LIGHT = colors.HexColor('#f8f9fa')
+_BRAND_MUTED = colors.HexColor('#7f8c8d')
+
+# Page geometry shared by every invoice
+_PAGE_SIZE = A4
+_PAGE_MARGIN = 0.75 * inch
+
+# Standard Type1 fonts are referenced by name, never embedded in the PDF.
+# Table cells default to the regular face, so styles only switch to bold.
+_FONT_BOLD = 'Helvetica-Bold'
+
+# Table styles are identical for every invoice, so build them once
+_HEADER_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+    ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+_DETAILS_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (0, -1), _FONT_BOLD),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('TEXTCOLOR', (0, 0), (-1, -1), _BRAND_DARK),
+])
+
+_LINE_ITEMS_STYLE = TableStyle([
+    # Header row styling
+    ('BACKGROUND', (0, 0), (-1, 0), _BRAND_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), _FONT_BOLD),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    
+    # Data rows styling
+    ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+    ('ALIGN', (0, 1), (0, -1), 'LEFT'),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('TEXTCOLOR', (0, 1), (-1, -1), _BRAND_DARK),
+    
+    # Grid and borders
+    ('GRID', (0, 0), (-1, -1), 1, _BRAND_GRAY),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    
+    # Alternating row colors
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _BRAND_LIGHT]),
+])
+
+_TOTALS_STYLE = TableStyle([
+    ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
+    ('FONTNAME', (0, 0), (0, -1), _FONT_BOLD),
+    ('FONTSIZE', (0, 0), (-1, -1), 11),
+    ('TEXTCOLOR', (0, 0), (-1, -1), _BRAND_DARK),
+    
+    # Make total row stand out
+    ('FONTNAME', (0, -1), (-1, -1), _FONT_BOLD),
+    ('FONTSIZE', (0, -1), (-1, -1), 12),
+    ('LINEABOVE', (0, -1), (-1, -1), 2, _BRAND_BLUE),
+])
+
+# Line items table header row
+_LINE_ITEM_HEADERS: tuple[str, ...] = ('Description', 'Quantity', 'Unit Price', 'Total')
+
+# English month names, so date formatting skips strftime's locale lookups
+_MONTHS = (
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December',
+)
+
+# Notes shorter than this may fit on one line and skip Paragraph markup parsing
+_SHORT_NOTES_LENGTH = 80
+
+# Process pool for rendering, created on first use
+_PDF_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_PDF_EXECUTOR_WORKERS = os.cpu_count() or 1
+_pdf_jobs_in_flight = 0
+
+# Service instance reused by each worker process
+_worker_service: Optional["InvoicePDFService"] = None
+
+
+def _format_date(value: date) -> str:
+    """Format a date like 'March 05, 2024', matching strftime('%B %d, %Y')"""
+    return f"{_MONTHS[value.month - 1]} {value.day:02d}, {value.year}"
+
+
+def _get_pdf_executor() -> ProcessPoolExecutor:
+    """Get the shared PDF rendering process pool"""
+    global _PDF_EXECUTOR
+    if _PDF_EXECUTOR is None:
+        # Spawn rather than fork so workers don't inherit the event loop state
+        _PDF_EXECUTOR = ProcessPoolExecutor(
+            max_workers=_PDF_EXECUTOR_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _PDF_EXECUTOR
+
+
+def _render_pdf_worker(
+    invoice: InvoicePDFSnapshot,
+    organization: OrganizationPDFSnapshot,
+    customer_data: dict,
+    output_path: Optional[str] = None,
+) -> Optional[bytes]:
+    """Render an invoice PDF inside a worker process"""
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = InvoicePDFService()
+    return _worker_service.generate_invoice_pdf(
+        invoice, organization, customer_data, output_path
+    )
+
+
 class InvoicePDFService:
     """Service for generating professional invoice PDFs"""
 
     def __init__(self):
-        self.page_size = A4
-        self.margin = 0.75 * inch
+        self.page_size = _PAGE_SIZE
+        self.margin = _PAGE_MARGIN
         self.styles = getSampleStyleSheet()
         self._setup_custom_styles()
 
@@ -30,7 +237,7 @@ class InvoicePDFService:
             name='CompanyName',
             parent=self.styles['Heading1'],
             fontSize=24,
-            textColor=colors.HexColor('#2c3e50'),
+            textColor=_BRAND_DARK,
             spaceAfter=6,
             alignment=0,  # Left alignment
         ))
@@ -40,7 +247,7 @@ class InvoicePDFService:
             name='InvoiceTitle',
             parent=self.styles['Heading1'],
             fontSize=20,
-            textColor=colors.HexColor('#34495e'),
+            textColor=_BRAND_SLATE,
             spaceAfter=12,
             alignment=2,  # Right alignment
         ))
@@ -50,7 +257,7 @@ class InvoicePDFService:
             name='SectionHeader',
             parent=self.styles['Heading2'],
             fontSize=12,
-            textColor=colors.HexColor('#2c3e50'),
+            textColor=_BRAND_DARK,
             spaceBefore=12,
             spaceAfter=6,
             leftIndent=0,
@@ -61,7 +268,7 @@ class InvoicePDFService:
             name='Address',
             parent=self.styles['Normal'],
             fontSize=10,
-            textColor=colors.HexColor('#34495e'),
+            textColor=_BRAND_SLATE,
             spaceAfter=3,
             leftIndent=0,
         ))
@@ -71,11 +278,21 @@ class InvoicePDFService:
             name='Total',
             parent=self.styles['Normal'],
             fontSize=12,
-            textColor=colors.HexColor('#2c3e50'),
+            textColor=_BRAND_DARK,
             alignment=2,  # Right alignment
         ))
 
-    def _format_currency(self, amount: float, organization: Organization) -> str:
+        # Footer style
+        self.styles.add(ParagraphStyle(
+            name='Footer',
+            parent=self.styles['Normal'],
+            fontSize=9,
+            textColor=_BRAND_MUTED,
+            alignment=1,  # Center alignment
+            spaceAfter=0,
+        ))
+
+    def _format_currency(self, amount: float, organization: OrganizationPDFSnapshot) -> str:
         """Format currency amount using organization's currency settings"""
         try:
             # Use the organization's currency symbol
@@ -86,43 +303,41 @@ class InvoicePDFService:
             # Fallback to USD formatting if organization currency data is missing
             return f"${amount:,.2f}"
 
+    def _currency_formatter(self, organization: OrganizationPDFSnapshot):
+        """Get a formatter applying the organization's currency symbol to amounts"""
+        # Use the organization's currency symbol, falling back to USD
+        symbol = getattr(organization, 'currency_symbol', None) or "$"
+        # Escape braces so the symbol is literal in the format string
+        return (symbol.replace('{', '{{').replace('}', '}}') + '{:,.2f}').format
+
     def generate_invoice_pdf(
         self, 
-        invoice: Invoice, 
-        organization: Organization,
+        invoice: InvoicePDFSnapshot, 
+        organization: OrganizationPDFSnapshot,
         customer_data: dict,
         output_path: Optional[str] = None
-    ) -> bytes:
+    ) -> Optional[bytes]:
         """
         Generate a professional invoice PDF
         
         Args:
-            invoice: Invoice model instance
-            organization: Organization model instance
+            invoice: Invoice snapshot
+            organization: Organization snapshot
             customer_data: Customer information dict
             output_path: Optional file path to save PDF
             
         Returns:
-            PDF content as bytes
+            PDF content as bytes, or None when the PDF was streamed to output_path
         """
-        # Create PDF buffer
-        buffer = io.BytesIO()
-        
-        # Create document
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=self.page_size,
-            rightMargin=self.margin,
-            leftMargin=self.margin,
-            topMargin=self.margin,
-            bottomMargin=self.margin,
-        )
-
         # Build PDF content
         story = []
         
+        # Header and footer text is cached per organization; the flowables are
+        # built fresh so concurrent builds never share layout state
+        template = _org_template(organization.name, organization.email)
+        
         # Header section
-        story.extend(self._build_header(organization, invoice))
+        story.extend(self._build_header(template))
         story.append(Spacer(1, 0.2 * inch))
         
         # Bill to section
@@ -147,43 +362,99 @@ class InvoicePDFService:
             story.append(Spacer(1, 0.2 * inch))
         
         # Footer section
-        story.extend(self._build_footer(organization))
+        story.extend(self._build_footer(template))
         
-        # Build PDF
-        doc.build(story)
+        # Stream straight to disk when a path is given, no in-memory copy
+        if output_path:
+            with open(output_path, 'wb', buffering=1 << 16) as f:
+                self._create_document(f).build(story)
+            return None
         
-        # Get PDF content
-        pdf_content = buffer.getvalue()
-        buffer.close()
+        # Otherwise render into an in-memory buffer
+        buffer = io.BytesIO()
+        try:
+            self._create_document(buffer).build(story)
+            with buffer.getbuffer() as view:
+                return view.tobytes()
+        finally:
+            buffer.close()
+
+    async def generate_invoice_pdf_async(
+        self,
+        invoice: InvoicePDFSnapshot,
+        organization: OrganizationPDFSnapshot,
+        customer_data: dict,
+        output_path: Optional[str] = None
+    ) -> Optional[bytes]:
+        """
+        Generate an invoice PDF without blocking the event loop
         
-        # Save to file if path provided
-        if output_path:
-            with open(output_path, 'wb') as f:
-                f.write(pdf_content)
+        Rendering runs in a process pool; when every worker is busy it falls
+        back to a thread in this process.
         
-        return pdf_content
+        Args:
+            invoice: Invoice snapshot
+            organization: Organization snapshot
+            customer_data: Customer information dict
+            output_path: Optional file path to save PDF
+            
+        Returns:
+            PDF content as bytes, or None when the PDF was streamed to output_path
+        """
+        global _pdf_jobs_in_flight
+        loop = asyncio.get_running_loop()
+        
+        if _pdf_jobs_in_flight >= _PDF_EXECUTOR_WORKERS:
+            return await loop.run_in_executor(
+                None,
+                self.generate_invoice_pdf,
+                invoice,
+                organization,
+                customer_data,
+                output_path,
+            )
+        
+        _pdf_jobs_in_flight += 1
+        try:
+            return await loop.run_in_executor(
+                _get_pdf_executor(),
+                _render_pdf_worker,
+                invoice,
+                organization,
+                customer_data,
+                output_path,
+            )
+        finally:
+            _pdf_jobs_in_flight -= 1
+
+    def _create_document(self, destination) -> SimpleDocTemplate:
+        """Create the document template writing to a file path or file-like object"""
+        return SimpleDocTemplate(
+            destination,
+            pagesize=self.page_size,
+            rightMargin=self.margin,
+            leftMargin=self.margin,
+            topMargin=self.margin,
+            bottomMargin=self.margin,
+        )
 
-    def _build_header(self, organization: Organization, invoice: Invoice) -> list:
+    def _build_header(self, template: _OrgTemplate) -> list:
         """Build the header section with company info and invoice title"""
         elements = []
         
         # Create header table with company info and invoice title
         header_data = [
             [
-                Paragraph(organization.name, self.styles['CompanyName']),
+                Paragraph(template.company_name, self.styles['CompanyName']),
                 Paragraph(f"INVOICE", self.styles['InvoiceTitle'])
             ]
         ]
         
         header_table = Table(header_data, colWidths=[4 * inch, 3 * inch])
-        header_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-            ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
+        header_table.setStyle(_HEADER_STYLE)
         
         elements.append(header_table)
-        elements.append(HRFlowable(width="100%", thickness=2, color=colors.HexColor('#3498db')))
+        elements.append(HRFlowable(width="100%", thickness=2, color=_BRAND_BLUE))
         
         return elements
 
@@ -208,82 +479,69 @@ class InvoicePDFService:
         
         return elements
 
-    def _build_invoice_details(self, invoice: Invoice) -> list:
+    def _build_invoice_details(self, invoice: InvoicePDFSnapshot) -> list:
         """Build the invoice details section"""
         elements = []
         
         # Invoice details table
         details_data = [
             ['Invoice Number:', invoice.invoice_number],
-            ['Invoice Date:', invoice.invoice_date.strftime('%B %d, %Y')],
-            ['Due Date:', invoice.due_date.strftime('%B %d, %Y')],
+            ['Invoice Date:', _format_date(invoice.invoice_date)],
+            ['Due Date:', _format_date(invoice.due_date)],
             ['Status:', invoice.status.title()],
         ]
         
         details_table = Table(details_data, colWidths=[1.5 * inch, 2 * inch])
-        details_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2c3e50')),
-        ]))
+        details_table.setStyle(_DETAILS_STYLE)
         
         elements.append(details_table)
         
         return elements
 
-    def _build_line_items_table(self, invoice: Invoice, organization: Organization) -> list:
+    def _build_line_items_table(self, invoice: InvoicePDFSnapshot, organization: OrganizationPDFSnapshot) -> list:
         """Build the line items table"""
+        items = invoice.items
+        columns = (
+            [item.description for item in items],
+            [item.quantity for item in items],
+            [item.unit_price for item in items],
+            [item.line_total for item in items],
+        )
+        return self._build_line_items_table_from_columns(columns, organization)
+
+    def _build_line_items_table_from_columns(
+        self, columns: tuple[list, list, list, list], organization: OrganizationPDFSnapshot
+    ) -> list:
+        """Build the line items table from description, quantity, unit price and total columns"""
         elements = []
-        
-        # Table headers
-        headers = ['Description', 'Quantity', 'Unit Price', 'Total']
-        table_data = [headers]
-        
-        # Add line items
-        for item in invoice.items:
-            row = [
-                item.description,
-                f"{item.quantity:,.2f}",
-                self._format_currency(item.unit_price, organization),
-                self._format_currency(item.line_total, organization)
-            ]
-            table_data.append(row)
+        descriptions, quantities, unit_prices, line_totals = columns
+        
+        # Format each column in one pass with a single bound formatter
+        format_currency = self._currency_formatter(organization)
+        
+        table_data = [
+            _LINE_ITEM_HEADERS,
+            *zip(
+                descriptions,
+                map('{:,.2f}'.format, quantities),
+                map(format_currency, unit_prices),
+                map(format_currency, line_totals),
+                strict=True,
+            ),
+        ]
         
         # Create table
         col_widths = [3.5 * inch, 1 * inch, 1.25 * inch, 1.25 * inch]
         items_table = Table(table_data, colWidths=col_widths)
         
         # Style the table
-        items_table.setStyle(TableStyle([
-            # Header row styling
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498db')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            
-            # Data rows styling
-            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-            ('ALIGN', (0, 1), (0, -1), 'LEFT'),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.HexColor('#2c3e50')),
-            
-            # Grid and borders
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#bdc3c7')),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            
-            # Alternating row colors
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-        ]))
+        items_table.setStyle(_LINE_ITEMS_STYLE)
         
         elements.append(items_table)
         
         return elements
 
-    def _build_totals_section(self, invoice: Invoice, organization: Organization) -> list:
+    def _build_totals_section(self, invoice: InvoicePDFSnapshot, organization: OrganizationPDFSnapshot) -> list:
         """Build the totals section"""
         elements = []
         
@@ -299,41 +557,41 @@ class InvoicePDFService:
             balance = invoice.total_amount - invoice.paid_amount
             totals_data.append(['Balance Due:', self._format_currency(balance, organization)])
         
-        # Create totals table (right-aligned)
+        # Create totals table
         totals_table = Table(totals_data, colWidths=[1.5 * inch, 1.5 * inch])
-        totals_table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'RIGHT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTNAME', (1, 0), (1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 11),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.HexColor('#2c3e50')),
-            
-            # Make total row stand out
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, -1), (-1, -1), 12),
-            ('LINEABOVE', (0, -1), (-1, -1), 2, colors.HexColor('#3498db')),
-        ]))
+        totals_table.setStyle(_TOTALS_STYLE)
         
-        # Right-align the totals table
-        totals_wrapper = Table([[totals_table]], colWidths=[7 * inch])
-        totals_wrapper.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (0, 0), 'RIGHT'),
-        ]))
+        # Right-align the totals table without a wrapper table
+        totals_table.hAlign = 'RIGHT'
         
-        elements.append(totals_wrapper)
+        elements.append(totals_table)
         
         return elements
 
-    def _build_notes_section(self, invoice: Invoice) -> list:
+    def _build_notes_section(self, invoice: InvoicePDFSnapshot) -> list:
         """Build the notes section"""
         elements = []
         
         elements.append(Paragraph("Notes:", self.styles['SectionHeader']))
-        elements.append(Paragraph(invoice.notes, self.styles['Normal']))
+        
+        notes = invoice.notes
+        style = self.styles['Normal']
+        frame_width = self.page_size[0] - 2 * self.margin
+        if (
+            len(notes) < _SHORT_NOTES_LENGTH
+            and '\n' not in notes
+            and stringWidth(notes, style.fontName, style.fontSize) <= frame_width
+        ):
+            # Fits on one line, rendered verbatim without the markup parser
+            elements.append(Preformatted(notes, style))
+        else:
+            # Escape user text so '<' and '&' can't break the Paragraph markup
+            safe_notes = escape(notes).replace('\n', '<br/>')
+            elements.append(Paragraph(safe_notes, style))
         
         return elements
 
-    def _build_footer(self, organization: Organization) -> list:
+    def _build_footer(self, template: _OrgTemplate) -> list:
         """Build the footer section"""
         elements = []
         
@@ -341,22 +599,9 @@ class InvoicePDFService:
         elements.append(Spacer(1, 0.5 * inch))
         
         # Footer line
-        elements.append(HRFlowable(width="100%", thickness=1, color=colors.HexColor('#bdc3c7')))
+        elements.append(HRFlowable(width="100%", thickness=1, color=_BRAND_GRAY))
         
         # Footer text
-        footer_text = f"Thank you for your business! | {organization.name}"
-        if hasattr(organization, 'email') and organization.email:
-            footer_text += f" | {organization.email}"
-        
-        footer_style = ParagraphStyle(
-            name='Footer',
-            parent=self.styles['Normal'],
-            fontSize=9,
-            textColor=colors.HexColor('#7f8c8d'),
-            alignment=1,  # Center alignment
-            spaceAfter=0,
-        )
-        
-        elements.append(Paragraph(footer_text, footer_style))
+        elements.append(Paragraph(template.footer_text, self.styles['Footer']))
         
         return elements
@@ -1,10 +1,14 @@
+import asyncio
+import time
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
-from sqlalchemy import select, and_, or_
+from sqlalchemy import insert, inspect, select, update, and_, or_, case, func, literal
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, make_transient_to_detached, raiseload, selectinload
 
 from app.models.subscription import (
     SubscriptionPlan,
@@ -17,6 +21,119 @@ from app.models.subscription import (
 from app.models.organization import Organization
 from app.services.paystack_service import PaystackService
 
+# In-process cache of active plans, keyed by type in sort order
+_PLAN_CACHE: dict[PlanType, SubscriptionPlan] = {}
+_PLAN_CACHE_EXPIRES_AT: float = 0.0
+_PLAN_CACHE_TTL = 300  # seconds
+_PLAN_CACHE_LOCK = asyncio.Lock()
+
+# Session.info key for subscriptions already looked up in this session,
+# keyed by organization id; sessions live for a single request
+_SESSION_SUBSCRIPTIONS_KEY = "organization_subscriptions"
+
+# Billing period lengths
+_YEARLY_PERIOD = timedelta(days=365)
+_MONTHLY_PERIOD = timedelta(days=30)
+
+
+def _billing_period(billing_interval: BillingInterval) -> timedelta:
+    """Length of one billing period for the interval"""
+    return _YEARLY_PERIOD if billing_interval == BillingInterval.YEARLY else _MONTHLY_PERIOD
+
+
+def _found_subscription(subscription: Optional[Subscription], subscription_id: int) -> Subscription:
+    """Return the looked-up subscription or raise if the ID matched nothing"""
+    if subscription is None:
+        raise ValueError(f"Subscription with ID {subscription_id} not found")
+    return subscription
+
+
+# Plan tiers from lowest to highest, used to tell downgrades from upgrades
+_PLAN_TIERS: dict[PlanType, int] = {
+    PlanType.FREE: 0,
+    PlanType.PROFESSIONAL: 1,
+    PlanType.ENTERPRISE: 2,
+}
+
+# Default plan prices in NGN
+_FREE_PRICE = Decimal("0.00")
+_PROFESSIONAL_MONTHLY_PRICE = Decimal("25000.00")  # ₦25,000/month
+_PROFESSIONAL_YEARLY_PRICE = Decimal("250000.00")  # ₦250,000/year (2 months free)
+_ENTERPRISE_MONTHLY_PRICE = Decimal("50000.00")  # ₦50,000/month
+_ENTERPRISE_YEARLY_PRICE = Decimal("500000.00")  # ₦500,000/year (2 months free)
+
+# Default plan catalog, inserted as-is by create_default_plans
+_DEFAULT_PLAN_ROWS: tuple[dict, ...] = (
+    {
+        "name": "Free Plan",
+        "plan_type": PlanType.FREE,
+        "description": "Perfect for trying out Arvalox",
+        "monthly_price": _FREE_PRICE,
+        "yearly_price": _FREE_PRICE,
+        "currency": "NGN",
+        "max_invoices_per_month": 5,
+        "max_customers": 10,
+        "max_team_members": 1,
+        "custom_branding": False,
+        "api_access": False,
+        "advanced_reporting": False,
+        "priority_support": False,
+        "multi_currency": False,
+        "is_active": True,
+        "sort_order": 1,
+    },
+    {
+        "name": "Professional Plan",
+        "plan_type": PlanType.PROFESSIONAL,
+        "description": "Perfect for growing businesses",
+        "monthly_price": _PROFESSIONAL_MONTHLY_PRICE,
+        "yearly_price": _PROFESSIONAL_YEARLY_PRICE,
+        "currency": "NGN",
+        "max_invoices_per_month": 500,
+        "max_customers": 1000,
+        "max_team_members": 10,
+        "custom_branding": True,
+        "api_access": True,
+        "advanced_reporting": True,
+        "priority_support": True,
+        "multi_currency": True,
+        "is_active": True,
+        "sort_order": 2,
+    },
+    {
+        "name": "Enterprise Plan",
+        "plan_type": PlanType.ENTERPRISE,
+        "description": "Unlimited power for large organizations",
+        "monthly_price": _ENTERPRISE_MONTHLY_PRICE,
+        "yearly_price": _ENTERPRISE_YEARLY_PRICE,
+        "currency": "NGN",
+        "max_invoices_per_month": None,  # Unlimited
+        "max_customers": None,  # Unlimited
+        "max_team_members": None,  # Unlimited
+        "custom_branding": True,
+        "api_access": True,
+        "advanced_reporting": True,
+        "priority_support": True,
+        "multi_currency": True,
+        "is_active": True,
+        "sort_order": 3,
+    },
+)
+
+# Built once; the rows are sent as parameters of a single multi-row INSERT
+_DEFAULT_PLANS_INSERT = insert(SubscriptionPlan).returning(
+    SubscriptionPlan, sort_by_parameter_order=True
+)
+
+
+def _detached_plan_copy(plan: SubscriptionPlan) -> SubscriptionPlan:
+    """Copy a loaded plan into a detached instance not bound to any session"""
+    copy = SubscriptionPlan(
+        **{attr.key: getattr(plan, attr.key) for attr in inspect(SubscriptionPlan).column_attrs}
+    )
+    make_transient_to_detached(copy)
+    return copy
+
 
 class SubscriptionService:
     """Service for managing subscriptions and plans"""
@@ -24,97 +141,81 @@ class SubscriptionService:
     @staticmethod
     async def create_default_plans(db: AsyncSession) -> List[SubscriptionPlan]:
         """Create default subscription plans with NGN pricing"""
-        plans = [
-            SubscriptionPlan(
-                name="Free Plan",
-                plan_type=PlanType.FREE,
-                description="Perfect for trying out Arvalox",
-                monthly_price=Decimal("0.00"),
-                yearly_price=Decimal("0.00"),
-                currency="NGN",
-                max_invoices_per_month=5,
-                max_customers=10,
-                max_team_members=1,
-                custom_branding=False,
-                api_access=False,
-                advanced_reporting=False,
-                priority_support=False,
-                multi_currency=False,
-                is_active=True,
-                sort_order=1,
-            ),
-            SubscriptionPlan(
-                name="Professional Plan",
-                plan_type=PlanType.PROFESSIONAL,
-                description="Perfect for growing businesses",
-                monthly_price=Decimal("25000.00"),  # ₦25,000/month
-                yearly_price=Decimal("250000.00"),  # ₦250,000/year (2 months free)
-                currency="NGN",
-                max_invoices_per_month=500,
-                max_customers=1000,
-                max_team_members=10,
-                custom_branding=True,
-                api_access=True,
-                advanced_reporting=True,
-                priority_support=True,
-                multi_currency=True,
-                is_active=True,
-                sort_order=2,
-            ),
-            SubscriptionPlan(
-                name="Enterprise Plan",
-                plan_type=PlanType.ENTERPRISE,
-                description="Unlimited power for large organizations",
-                monthly_price=Decimal("50000.00"),  # ₦50,000/month
-                yearly_price=Decimal("500000.00"),  # ₦500,000/year (2 months free)
-                currency="NGN",
-                max_invoices_per_month=None,  # Unlimited
-                max_customers=None,  # Unlimited
-                max_team_members=None,  # Unlimited
-                custom_branding=True,
-                api_access=True,
-                advanced_reporting=True,
-                priority_support=True,
-                multi_currency=True,
-                is_active=True,
-                sort_order=3,
-            ),
-        ]
+        # Check if plans already exist without loading them
+        result = await db.execute(select(SubscriptionPlan.id).limit(1))
+        if result.first() is not None:
+            return await SubscriptionService.get_all_plans(db)
 
-        # Check if plans already exist
-        result = await db.execute(select(SubscriptionPlan))
-        existing_plans = result.scalars().all()
-        
-        if not existing_plans:
-            for plan in plans:
-                db.add(plan)
-            await db.commit()
-            
-            # Refresh to get IDs
-            for plan in plans:
-                await db.refresh(plan)
+        # One multi-row INSERT; RETURNING brings back ids and server defaults
+        result = await db.scalars(_DEFAULT_PLANS_INSERT, list(_DEFAULT_PLAN_ROWS))
+        plans = result.all()
+        await db.commit()
+        SubscriptionService.invalidate_plan_cache()
         
         return plans
 
+    @staticmethod
+    def invalidate_plan_cache() -> None:
+        """Drop cached plans so the next lookup reads them from the database"""
+        global _PLAN_CACHE_EXPIRES_AT
+        _PLAN_CACHE.clear()
+        _PLAN_CACHE_EXPIRES_AT = 0.0
+
+    @staticmethod
+    async def _get_cached_plans(db: AsyncSession) -> dict[PlanType, SubscriptionPlan]:
+        """Get active plans from the in-process cache, loading them when expired"""
+        global _PLAN_CACHE_EXPIRES_AT
+        if time.monotonic() < _PLAN_CACHE_EXPIRES_AT:
+            return _PLAN_CACHE
+        
+        async with _PLAN_CACHE_LOCK:
+            # Another task may have refreshed the cache while we waited
+            if time.monotonic() >= _PLAN_CACHE_EXPIRES_AT:
+                result = await db.execute(
+                    select(SubscriptionPlan)
+                    .where(SubscriptionPlan.is_active == True)
+                    .order_by(SubscriptionPlan.sort_order)
+                )
+                plans = result.scalars().all()
+                
+                _PLAN_CACHE.clear()
+                _PLAN_CACHE.update({plan.plan_type: _detached_plan_copy(plan) for plan in plans})
+                _PLAN_CACHE_EXPIRES_AT = time.monotonic() + _PLAN_CACHE_TTL
+        
+        return _PLAN_CACHE
+
     @staticmethod
     async def get_all_plans(db: AsyncSession) -> List[SubscriptionPlan]:
         """Get all active subscription plans"""
-        result = await db.execute(
-            select(SubscriptionPlan)
-            .where(SubscriptionPlan.is_active == True)
-            .order_by(SubscriptionPlan.sort_order)
-        )
-        return result.scalars().all()
+        plans = await SubscriptionService._get_cached_plans(db)
+        # Attach cached copies to this session without another SELECT
+        return [await db.merge(plan, load=False) for plan in plans.values()]
 
     @staticmethod
     async def get_plan_by_type(db: AsyncSession, plan_type: PlanType) -> Optional[SubscriptionPlan]:
         """Get a plan by its type"""
+        plans = await SubscriptionService._get_cached_plans(db)
+        if plan_type in plans:
+            return await db.merge(plans[plan_type], load=False)
+        
+        # Inactive plans are not cached
         result = await db.execute(
             select(SubscriptionPlan)
             .where(SubscriptionPlan.plan_type == plan_type)
         )
         return result.scalar_one_or_none()
 
+    @staticmethod
+    async def get_plan_by_id(db: AsyncSession, plan_id: int) -> Optional[SubscriptionPlan]:
+        """Get a plan by its ID"""
+        plans = await SubscriptionService._get_cached_plans(db)
+        for plan in plans.values():
+            if plan.id == plan_id:
+                return await db.merge(plan, load=False)
+        
+        # Inactive plans are not cached
+        return await db.get(SubscriptionPlan, plan_id)
+
     @staticmethod
     async def create_subscription(
         db: AsyncSession,
@@ -128,10 +229,7 @@ class SubscriptionService:
         now = datetime.now(timezone.utc)
         
         # Calculate period dates
-        if billing_interval == BillingInterval.YEARLY:
-            period_end = now + timedelta(days=365)
-        else:
-            period_end = now + timedelta(days=30)
+        period_end = now + _billing_period(billing_interval)
         
         subscription_data = {
             "organization_id": organization_id,
@@ -151,10 +249,12 @@ class SubscriptionService:
             subscription_data["trial_start"] = now
             subscription_data["trial_end"] = now + timedelta(days=trial_days)
         
-        subscription = Subscription(**subscription_data)
-        db.add(subscription)
+        # RETURNING hands back server defaults without a follow-up refresh
+        subscription = await db.scalar(
+            insert(Subscription).values(**subscription_data).returning(Subscription)
+        )
+        SubscriptionService.forget_cached_subscriptions(db)
         await db.commit()
-        await db.refresh(subscription)
         
         return subscription
 
@@ -164,12 +264,25 @@ class SubscriptionService:
         organization_id: int
     ) -> Optional[Subscription]:
         """Get an organization's current subscription"""
+        # Limit checks and route handlers often ask twice in one request
+        cached = db.info.setdefault(_SESSION_SUBSCRIPTIONS_KEY, {})
+        if organization_id in cached:
+            return cached[organization_id]
+        
+        # Any other relationship access raises instead of lazy loading
         result = await db.execute(
             select(Subscription)
-            .options(selectinload(Subscription.plan))
+            .options(selectinload(Subscription.plan), raiseload("*"))
             .where(Subscription.organization_id == organization_id)
         )
-        return result.scalar_one_or_none()
+        subscription = result.scalar_one_or_none()
+        cached[organization_id] = subscription
+        return subscription
+
+    @staticmethod
+    def forget_cached_subscriptions(db: AsyncSession) -> None:
+        """Drop subscriptions memoized on this session by get_organization_subscription"""
+        db.info.pop(_SESSION_SUBSCRIPTIONS_KEY, None)
 
     @staticmethod
     async def upgrade_subscription(
@@ -179,34 +292,40 @@ class SubscriptionService:
         billing_interval: Optional[BillingInterval] = None,
     ) -> Subscription:
         """Upgrade/change a subscription plan"""
-        # Get current subscription
-        result = await db.execute(
-            select(Subscription)
-            .where(Subscription.id == subscription_id)
-        )
-        subscription = result.scalar_one()
-        
-        # Update plan
-        subscription.plan_id = new_plan_id
+        values = {
+            "plan_id": new_plan_id,
+            # If upgrading from trial, make it active
+            "status": case(
+                (
+                    Subscription.status == SubscriptionStatus.TRIALING,
+                    literal(SubscriptionStatus.ACTIVE, Subscription.status.type),
+                ),
+                else_=Subscription.status,
+            ),
+        }
         
         # Update billing interval if provided
         if billing_interval:
-            subscription.billing_interval = billing_interval
+            values["billing_interval"] = billing_interval
             
             # Recalculate period dates based on new billing interval
             now = datetime.now(timezone.utc)
-            subscription.current_period_start = now
-            if billing_interval == BillingInterval.YEARLY:
-                subscription.current_period_end = now + timedelta(days=365)
-            else:
-                subscription.current_period_end = now + timedelta(days=30)
+            values["current_period_start"] = now
+            values["current_period_end"] = now + _billing_period(billing_interval)
         
-        # If upgrading from trial, make it active
-        if subscription.status == SubscriptionStatus.TRIALING:
-            subscription.status = SubscriptionStatus.ACTIVE
+        result = await db.execute(
+            update(Subscription)
+            .where(Subscription.id == subscription_id)
+            .values(**values)
+            .returning(Subscription)
+            # A plan loaded before the UPDATE would otherwise still be the old one
+            .options(selectinload(Subscription.plan)),
+            execution_options={"populate_existing": True},
+        )
+        subscription = _found_subscription(result.scalar_one_or_none(), subscription_id)
         
+        SubscriptionService.forget_cached_subscriptions(db)
         await db.commit()
-        await db.refresh(subscription)
         
         return subscription
 
@@ -217,24 +336,23 @@ class SubscriptionService:
         cancel_immediately: bool = False,
     ) -> Subscription:
         """Cancel a subscription"""
+        now = datetime.now(timezone.utc)
+        
+        # Without immediate cancellation it runs until end of current period
         result = await db.execute(
-            select(Subscription)
+            update(Subscription)
             .where(Subscription.id == subscription_id)
+            .values(
+                canceled_at=now,
+                status=SubscriptionStatus.CANCELED,
+                ended_at=now if cancel_immediately else None,
+            )
+            .returning(Subscription)
         )
-        subscription = result.scalar_one()
-        
-        now = datetime.now(timezone.utc)
-        subscription.canceled_at = now
-        
-        if cancel_immediately:
-            subscription.status = SubscriptionStatus.CANCELED
-            subscription.ended_at = now
-        else:
-            # Let it run until end of current period
-            subscription.status = SubscriptionStatus.CANCELED
+        subscription = _found_subscription(result.scalar_one_or_none(), subscription_id)
         
+        SubscriptionService.forget_cached_subscriptions(db)
         await db.commit()
-        await db.refresh(subscription)
         
         return subscription
 
@@ -244,31 +362,37 @@ class SubscriptionService:
         subscription_id: int,
     ) -> Subscription:
         """Reactivate a canceled subscription"""
+        now = datetime.now(timezone.utc)
+        
+        # Extend current period if it has passed
+        period_expired = Subscription.current_period_end <= now
+        new_period_end = case(
+            (Subscription.billing_interval == BillingInterval.YEARLY, now + _YEARLY_PERIOD),
+            else_=now + _MONTHLY_PERIOD,
+        )
+        
         result = await db.execute(
-            select(Subscription)
+            update(Subscription)
             .where(Subscription.id == subscription_id)
+            .values(
+                status=SubscriptionStatus.ACTIVE,
+                canceled_at=None,
+                ended_at=None,
+                current_period_end=case(
+                    (period_expired, new_period_end),
+                    else_=Subscription.current_period_end,
+                ),
+                current_period_start=case(
+                    (period_expired, now),
+                    else_=Subscription.current_period_start,
+                ),
+            )
+            .returning(Subscription)
         )
-        subscription = result.scalar_one()
-        
-        subscription.status = SubscriptionStatus.ACTIVE
-        subscription.canceled_at = None
-        subscription.ended_at = None
-        
-        # Extend current period if it has passed
-        now = datetime.now(timezone.utc)
-        # Make sure we're comparing timezone-aware datetimes
-        current_end = subscription.current_period_end
-        if current_end.tzinfo is None:
-            current_end = current_end.replace(tzinfo=timezone.utc)
-        if current_end <= now:
-            if subscription.billing_interval == BillingInterval.YEARLY:
-                subscription.current_period_end = now + timedelta(days=365)
-            else:
-                subscription.current_period_end = now + timedelta(days=30)
-            subscription.current_period_start = now
+        subscription = _found_subscription(result.scalar_one_or_none(), subscription_id)
         
+        SubscriptionService.forget_cached_subscriptions(db)
         await db.commit()
-        await db.refresh(subscription)
         
         return subscription
 
@@ -282,37 +406,50 @@ class SubscriptionService:
         auto_commit: bool = True,
     ) -> Subscription:
         """Update usage counters for a subscription with monthly reset support"""
-        result = await db.execute(
-            select(Subscription)
-            .where(Subscription.id == subscription_id)
-        )
-        subscription = result.scalar_one()
+        values = {}
         
-        # Use the new reset-aware methods
-        if invoice_count_delta > 0:
-            for _ in range(invoice_count_delta):
-                subscription.increment_invoice_count()
-        elif invoice_count_delta < 0:
-            subscription.reset_monthly_usage_if_needed()
-            subscription.current_invoice_count = max(0, subscription.current_invoice_count + invoice_count_delta)
+        if invoice_count_delta != 0:
+            # Same rules as Subscription.reset_monthly_usage_if_needed, applied in SQL
+            period_restarted = and_(
+                Subscription.last_invoice_reset_date.isnot(None),
+                Subscription.current_period_start > Subscription.last_invoice_reset_date,
+            )
+            invoice_count = case((period_restarted, 0), else_=Subscription.current_invoice_count)
+            values["current_invoice_count"] = func.greatest(invoice_count + invoice_count_delta, 0)
+            # GREATEST ignores NULLs, so an unset reset date becomes the period start
+            values["last_invoice_reset_date"] = func.greatest(
+                Subscription.last_invoice_reset_date, Subscription.current_period_start
+            )
         
         if customer_count_delta != 0:
-            if customer_count_delta > 0:
-                for _ in range(customer_count_delta):
-                    subscription.increment_customer_count()
-            else:
-                subscription.current_customer_count = max(0, subscription.current_customer_count + customer_count_delta)
+            values["current_customer_count"] = func.greatest(
+                Subscription.current_customer_count + customer_count_delta, 0
+            )
         
-        if team_member_count_delta != 0:
-            if team_member_count_delta > 0:
-                for _ in range(team_member_count_delta):
-                    subscription.increment_team_member_count()
-            else:
-                subscription.current_team_member_count = max(1, subscription.current_team_member_count + team_member_count_delta)  # Min 1 for owner
+        if team_member_count_delta > 0:
+            values["current_team_member_count"] = (
+                Subscription.current_team_member_count + team_member_count_delta
+            )
+        elif team_member_count_delta < 0:
+            values["current_team_member_count"] = func.greatest(
+                Subscription.current_team_member_count + team_member_count_delta, 1
+            )  # Min 1 for owner
+        
+        if values:
+            result = await db.execute(
+                update(Subscription)
+                .where(Subscription.id == subscription_id)
+                .values(**values)
+                .returning(Subscription)
+            )
+            subscription = result.scalar_one_or_none()
+        else:
+            # Nothing to change, the identity map may already hold it
+            subscription = await db.get(Subscription, subscription_id)
+        subscription = _found_subscription(subscription, subscription_id)
         
         if auto_commit:
             await db.commit()
-            await db.refresh(subscription)
         
         return subscription
 
@@ -348,46 +485,50 @@ class SubscriptionService:
         api_calls_made: int = 0,
     ) -> UsageRecord:
         """Create or update a usage record"""
-        # Try to get existing record
-        usage_record = await SubscriptionService.get_usage_record(
-            db, subscription_id, month, year
+        # Single atomic upsert keyed on the (subscription, month, year) constraint
+        stmt = pg_insert(UsageRecord).values(
+            subscription_id=subscription_id,
+            month=month,
+            year=year,
+            invoices_created=invoices_created,
+            customers_created=customers_created,
+            team_members_added=team_members_added,
+            api_calls_made=api_calls_made,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UsageRecord.subscription_id, UsageRecord.month, UsageRecord.year],
+            set_={
+                "invoices_created": UsageRecord.invoices_created + stmt.excluded.invoices_created,
+                "customers_created": UsageRecord.customers_created + stmt.excluded.customers_created,
+                "team_members_added": UsageRecord.team_members_added + stmt.excluded.team_members_added,
+                "api_calls_made": UsageRecord.api_calls_made + stmt.excluded.api_calls_made,
+                "updated_at": func.now(),
+            },
         )
         
-        if usage_record:
-            # Update existing record
-            usage_record.invoices_created += invoices_created
-            usage_record.customers_created += customers_created
-            usage_record.team_members_added += team_members_added
-            usage_record.api_calls_made += api_calls_made
-        else:
-            # Create new record
-            usage_record = UsageRecord(
-                subscription_id=subscription_id,
-                month=month,
-                year=year,
-                invoices_created=invoices_created,
-                customers_created=customers_created,
-                team_members_added=team_members_added,
-                api_calls_made=api_calls_made,
-            )
-            db.add(usage_record)
+        result = await db.execute(
+            stmt.returning(UsageRecord),
+            execution_options={"populate_existing": True},
+        )
+        usage_record = result.scalar_one()
         
         await db.commit()
-        await db.refresh(usage_record)
         
         return usage_record
 
     @staticmethod
-    async def get_expiring_subscriptions(
-        db: AsyncSession,
-        days_ahead: int = 7,
-    ) -> List[Subscription]:
-        """Get subscriptions expiring within specified days"""
+    def _expiring_subscriptions_query(days_ahead: int):
+        """Build the query for subscriptions expiring within specified days"""
         future_date = datetime.now(timezone.utc) + timedelta(days=days_ahead)
         
-        result = await db.execute(
+        # Plans are a handful of rows, so join them instead of a second SELECT
+        return (
             select(Subscription)
-            .options(selectinload(Subscription.organization), selectinload(Subscription.plan))
+            .options(
+                selectinload(Subscription.organization),
+                joinedload(Subscription.plan),
+                raiseload("*"),
+            )
             .where(
                 and_(
                     Subscription.current_period_end <= future_date,
@@ -395,25 +536,45 @@ class SubscriptionService:
                 )
             )
         )
+
+    @staticmethod
+    async def get_expiring_subscriptions(
+        db: AsyncSession,
+        days_ahead: int = 7,
+    ) -> List[Subscription]:
+        """Get subscriptions expiring within specified days"""
+        result = await db.execute(
+            SubscriptionService._expiring_subscriptions_query(days_ahead)
+        )
         return result.scalars().all()
 
+    @staticmethod
+    async def stream_expiring_subscriptions(
+        db: AsyncSession,
+        days_ahead: int = 7,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[Subscription]:
+        """Stream subscriptions expiring within specified days in batches"""
+        query = SubscriptionService._expiring_subscriptions_query(days_ahead)
+        result = await db.stream(query.execution_options(yield_per=batch_size))
+        async for subscription in result.scalars():
+            yield subscription
+
     @staticmethod
     async def reset_monthly_usage_counts(db: AsyncSession) -> None:
         """Reset monthly usage counters for all active subscriptions"""
-        result = await db.execute(
-            select(Subscription)
+        # Note: We don't reset customer and team member counts as they're cumulative
+        await db.execute(
+            update(Subscription)
             .where(
                 Subscription.status.in_([
                     SubscriptionStatus.ACTIVE,
                     SubscriptionStatus.TRIALING
                 ])
             )
+            .values(current_invoice_count=0)
+            .execution_options(synchronize_session=False)
         )
-        subscriptions = result.scalars().all()
-        
-        for subscription in subscriptions:
-            subscription.current_invoice_count = 0
-            # Note: We don't reset customer and team member counts as they're cumulative
         
         await db.commit()
 
@@ -423,38 +584,32 @@ class SubscriptionService:
         subscription_id: int
     ) -> Subscription:
         """Sync usage counts with actual database counts"""
-        result = await db.execute(
-            select(Subscription)
-            .options(selectinload(Subscription.organization))
-            .where(Subscription.id == subscription_id)
+        subscription = _found_subscription(
+            await db.get(Subscription, subscription_id), subscription_id
         )
-        subscription = result.scalar_one()
         
         # Get actual counts from database
         from app.models.invoice import Invoice
         from app.models.customer import Customer
         from app.models.user import User
         
-        # Count invoices for this organization
-        invoice_result = await db.execute(
-            select(Invoice)
-            .where(Invoice.organization_id == subscription.organization_id)
-        )
-        invoice_count = len(invoice_result.scalars().all())
-        
-        # Count customers for this organization
-        customer_result = await db.execute(
-            select(Customer)
-            .where(Customer.organization_id == subscription.organization_id)
-        )
-        customer_count = len(customer_result.scalars().all())
+        # Count in the database in a single round trip rather than loading every row
+        def count_for_organization(model):
+            return (
+                select(func.count())
+                .select_from(model)
+                .where(model.organization_id == subscription.organization_id)
+                .scalar_subquery()
+            )
         
-        # Count team members for this organization
-        user_result = await db.execute(
-            select(User)
-            .where(User.organization_id == subscription.organization_id)
-        )
-        team_member_count = len(user_result.scalars().all())
+        counts = (await db.execute(
+            select(
+                count_for_organization(Invoice),
+                count_for_organization(Customer),
+                count_for_organization(User),
+            )
+        )).one()
+        invoice_count, customer_count, team_member_count = counts
         
         # Update subscription counts
         subscription.current_invoice_count = invoice_count
@@ -482,10 +637,9 @@ class SubscriptionService:
         paystack = PaystackService()
         
         # Get plan details
-        result = await db.execute(
-            select(SubscriptionPlan).where(SubscriptionPlan.id == plan_id)
-        )
-        plan = result.scalar_one()
+        plan = await SubscriptionService.get_plan_by_id(db, plan_id)
+        if plan is None:
+            raise ValueError(f"Plan with ID {plan_id} not found")
         
         # Determine amount based on billing interval
         amount = plan.monthly_price if billing_interval == BillingInterval.MONTHLY else plan.yearly_price
@@ -524,11 +678,9 @@ class SubscriptionService:
         if transaction_data["status"] != "success":
             raise Exception("Transaction was not successful")
             
-        # Get plan details
-        result = await db.execute(
-            select(SubscriptionPlan).where(SubscriptionPlan.id == plan_id)
-        )
-        plan = result.scalar_one()
+        # Make sure the plan exists
+        if await SubscriptionService.get_plan_by_id(db, plan_id) is None:
+            raise NoResultFound(f"Subscription plan {plan_id} not found")
         
         # Check if subscription already exists
         existing_result = await db.execute(
@@ -546,16 +698,14 @@ class SubscriptionService:
             # Update period dates based on new billing interval
             now = datetime.now(timezone.utc)
             existing_subscription.current_period_start = now
-            if billing_interval == BillingInterval.YEARLY:
-                existing_subscription.current_period_end = now + timedelta(days=365)
-            else:
-                existing_subscription.current_period_end = now + timedelta(days=30)
+            existing_subscription.current_period_end = now + _billing_period(billing_interval)
             
             # Reset trial if it was trial
             if existing_subscription.status == SubscriptionStatus.TRIALING:
                 existing_subscription.trial_end = None
                 existing_subscription.trial_start = None
             
+            SubscriptionService.forget_cached_subscriptions(db)
             await db.commit()
             await db.refresh(existing_subscription)
             return existing_subscription
@@ -579,30 +729,51 @@ class SubscriptionService:
     @staticmethod
     async def setup_paystack_plans(db: AsyncSession) -> None:
         """Create Paystack plans for all subscription plans"""
-        paystack = PaystackService()
-        
-        # Get all active plans
+        # Only paid plans still missing a Paystack plan code
         result = await db.execute(
-            select(SubscriptionPlan).where(SubscriptionPlan.is_active == True)
+            select(SubscriptionPlan).where(
+                SubscriptionPlan.is_active == True,
+                SubscriptionPlan.plan_type != PlanType.FREE,
+                or_(
+                    and_(
+                        SubscriptionPlan.paystack_plan_code_monthly.is_(None),
+                        SubscriptionPlan.monthly_price > 0,
+                    ),
+                    and_(
+                        SubscriptionPlan.paystack_plan_code_yearly.is_(None),
+                        SubscriptionPlan.yearly_price > 0,
+                    ),
+                ),
+            )
         )
         plans = result.scalars().all()
         
+        # Nothing to provision, so don't contact Paystack at all
+        if not plans:
+            return
+        
+        missing = []
         for plan in plans:
-            # Skip free plan
-            if plan.plan_type == PlanType.FREE:
-                continue
-                
-            # Create monthly plan if not exists
             if not plan.paystack_plan_code_monthly and plan.monthly_price > 0:
-                monthly_plan = await paystack.create_subscription_plan(plan, BillingInterval.MONTHLY)
-                plan.paystack_plan_code_monthly = monthly_plan["plan_code"]
-            
-            # Create yearly plan if not exists
+                missing.append((plan, BillingInterval.MONTHLY))
             if not plan.paystack_plan_code_yearly and plan.yearly_price > 0:
-                yearly_plan = await paystack.create_subscription_plan(plan, BillingInterval.YEARLY)
-                plan.paystack_plan_code_yearly = yearly_plan["plan_code"]
+                missing.append((plan, BillingInterval.YEARLY))
+        
+        # The create calls are independent HTTP requests, so run them concurrently
+        paystack = PaystackService()
+        paystack_plans = await asyncio.gather(*(
+            paystack.create_subscription_plan(plan, billing_interval)
+            for plan, billing_interval in missing
+        ))
+        
+        for (plan, billing_interval), paystack_plan in zip(missing, paystack_plans, strict=True):
+            if billing_interval == BillingInterval.MONTHLY:
+                plan.paystack_plan_code_monthly = paystack_plan["plan_code"]
+            else:
+                plan.paystack_plan_code_yearly = paystack_plan["plan_code"]
         
         await db.commit()
+        SubscriptionService.invalidate_plan_cache()
 
     @staticmethod
     async def verify_paystack_payment(
@@ -628,26 +799,26 @@ class SubscriptionService:
         target_plan_id: int
     ) -> Subscription:
         """Schedule a downgrade to take effect at end of current billing period"""
-        result = await db.execute(
-            select(Subscription)
-            .options(selectinload(Subscription.plan), selectinload(Subscription.downgrade_plan))
-            .where(Subscription.id == subscription_id)
-        )
-        subscription = result.scalar_one()
-        
         # Validate target plan exists
-        target_plan_result = await db.execute(
-            select(SubscriptionPlan).where(SubscriptionPlan.id == target_plan_id)
-        )
-        target_plan = target_plan_result.scalar_one_or_none()
+        target_plan = await SubscriptionService.get_plan_by_id(db, target_plan_id)
         if not target_plan:
             raise ValueError(f"Target plan with ID {target_plan_id} not found")
         
-        # Schedule the downgrade
-        subscription.schedule_downgrade(target_plan_id)
+        # Schedule the downgrade in one UPDATE, no need to load the subscription first
+        result = await db.execute(
+            update(Subscription)
+            .where(Subscription.id == subscription_id)
+            .values(
+                downgrade_to_plan_id=target_plan_id,
+                downgrade_effective_date=Subscription.current_period_end,
+            )
+            .returning(Subscription),
+            execution_options={"populate_existing": True},
+        )
+        subscription = _found_subscription(result.scalar_one_or_none(), subscription_id)
         
+        SubscriptionService.forget_cached_subscriptions(db)
         await db.commit()
-        await db.refresh(subscription)
         
         return subscription
 
@@ -658,14 +829,15 @@ class SubscriptionService:
     ) -> Subscription:
         """Cancel a scheduled downgrade"""
         result = await db.execute(
-            select(Subscription).where(Subscription.id == subscription_id)
+            update(Subscription)
+            .where(Subscription.id == subscription_id)
+            .values(downgrade_to_plan_id=None, downgrade_effective_date=None)
+            .returning(Subscription)
         )
-        subscription = result.scalar_one()
-        
-        subscription.cancel_downgrade()
+        subscription = _found_subscription(result.scalar_one_or_none(), subscription_id)
         
+        SubscriptionService.forget_cached_subscriptions(db)
         await db.commit()
-        await db.refresh(subscription)
         
         return subscription
 
@@ -674,28 +846,31 @@ class SubscriptionService:
         """Process all scheduled downgrades that are due"""
         now = datetime.now(timezone.utc)
         
-        # Find subscriptions with downgrades due
+        # Apply every due downgrade in one UPDATE instead of row by row
         result = await db.execute(
-            select(Subscription)
-            .options(selectinload(Subscription.plan), selectinload(Subscription.downgrade_plan))
+            update(Subscription)
             .where(
                 and_(
                     Subscription.downgrade_to_plan_id.isnot(None),
                     Subscription.downgrade_effective_date <= now
                 )
             )
+            .values(
+                plan_id=Subscription.downgrade_to_plan_id,
+                downgrade_to_plan_id=None,
+                downgrade_effective_date=None,
+            )
+            .returning(Subscription)
+            # New plans come back in one IN query, anything else raises instead of lazy loading
+            .options(selectinload(Subscription.plan), raiseload("*")),
+            # RETURNING refreshes loaded rows, no need to evaluate the WHERE in Python
+            execution_options={"populate_existing": True, "synchronize_session": False},
         )
-        subscriptions = result.scalars().all()
-        
-        processed = []
-        for subscription in subscriptions:
-            if subscription.apply_downgrade():
-                processed.append(subscription)
+        processed = result.scalars().all()
         
         if processed:
+            SubscriptionService.forget_cached_subscriptions(db)
             await db.commit()
-            for sub in processed:
-                await db.refresh(sub)
         
         return processed
 
@@ -707,28 +882,19 @@ class SubscriptionService:
         billing_interval: BillingInterval | None = None
     ) -> Subscription:
         """Update subscription plan with enhanced downgrade logic"""
-        result = await db.execute(
-            select(Subscription)
-            .options(selectinload(Subscription.plan))
-            .where(Subscription.id == subscription_id)
+        # Plan is selectin-loaded; usually already in the session from the caller
+        subscription = _found_subscription(
+            await db.get(Subscription, subscription_id), subscription_id
         )
-        subscription = result.scalar_one()
         
         # Get target plan
-        target_plan_result = await db.execute(
-            select(SubscriptionPlan).where(SubscriptionPlan.id == plan_id)
-        )
-        target_plan = target_plan_result.scalar_one()
+        target_plan = await SubscriptionService.get_plan_by_id(db, plan_id)
+        if not target_plan:
+            raise ValueError(f"Target plan with ID {plan_id} not found")
         
         # Determine if this is a downgrade (higher tier to lower tier)
-        current_plan_tiers = {
-            PlanType.FREE: 0,
-            PlanType.PROFESSIONAL: 1,
-            PlanType.ENTERPRISE: 2
-        }
-        
-        current_tier = current_plan_tiers.get(subscription.plan.plan_type, 0)
-        target_tier = current_plan_tiers.get(target_plan.plan_type, 0)
+        current_tier = _PLAN_TIERS.get(subscription.plan.plan_type, 0)
+        target_tier = _PLAN_TIERS.get(target_plan.plan_type, 0)
         
         # If downgrading and subscription is paid (not free), schedule the downgrade
         if (target_tier < current_tier and 
@@ -746,10 +912,7 @@ class SubscriptionService:
                 
                 # Recalculate period for free plans or upgrades
                 now = datetime.now(timezone.utc)
-                if billing_interval == BillingInterval.YEARLY:
-                    subscription.current_period_end = now + timedelta(days=365)
-                else:
-                    subscription.current_period_end = now + timedelta(days=30)
+                subscription.current_period_end = now + _billing_period(billing_interval)
                 subscription.current_period_start = now
             
             # Reset usage for monthly counter when changing plans
@@ -759,6 +922,7 @@ class SubscriptionService:
             if subscription.status == SubscriptionStatus.TRIALING:
                 subscription.status = SubscriptionStatus.ACTIVE
             
+            SubscriptionService.forget_cached_subscriptions(db)
             await db.commit()
             await db.refresh(subscription)
             
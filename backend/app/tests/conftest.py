@@ -1,42 +1,191 @@
 import asyncio
-from collections.abc import AsyncGenerator
+import hashlib
+import os
+import sys
+from collections.abc import AsyncGenerator, Callable
 
 import httpx
 import pytest
 import pytest_asyncio
+from fastapi import FastAPI
 from httpx import AsyncClient
+from sqlalchemy import URL, make_url, text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import (
     AsyncSession,
     create_async_engine,
 )
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from app.core.config import settings
 from app.core.database import Base, get_db
-from app.main import app
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    get_password_hash,
+    pwd_context,
+)
+from app.main import create_app
+from app.services.subscription_service import SubscriptionService
 
+try:
+    import uvloop
+except ImportError:  # Optional, not available on Windows
+    uvloop = None
 
-@pytest_asyncio.fixture(scope="function")
-async def test_engine():
-    """Create test database engine for each test"""
-    engine = create_async_engine(
+# bcrypt's minimum work factor; production rounds cost ~300 ms per hash.
+# Hashes made at any cost still verify, the rounds are stored in the hash.
+pwd_context.update(bcrypt__rounds=4)
+
+
+# Set by pytest-xdist in each worker process, e.g. "gw0"
+_XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+
+
+def _base_test_database_url() -> URL:
+    return make_url(
         settings.test_database_url
-        or settings.database_url.replace("arvalox_dev", "arvalox_test"),
+        or settings.database_url.replace("arvalox_dev", "arvalox_test")
+    )
+
+
+def _test_database_url() -> URL:
+    """URL of this process's test database, one per xdist worker"""
+    url = _base_test_database_url()
+    if _XDIST_WORKER:
+        return url.set(database=f"{url.database}_{_XDIST_WORKER}")
+    return url
+
+
+def _create_test_engine(url: URL | None = None, **kwargs):
+    return create_async_engine(
+        url or _test_database_url(),
         echo=False,
-        pool_pre_ping=True,
-        pool_recycle=300,
+        # Every checkout opens a connection on the running event loop, so no
+        # asyncpg connection is ever shared between test loops
+        poolclass=NullPool,
         connect_args={
             "server_settings": {
                 "application_name": "arvalox_test",
             }
         },
+        **kwargs,
     )
+
+
+def _schema_fingerprint() -> str:
+    """Short hash of the schema DDL, so model changes get a fresh template"""
+    dialect = postgresql.dialect()
+    ddl = []
+    for table in Base.metadata.sorted_tables:
+        ddl.append(str(CreateTable(table).compile(dialect=dialect)))
+        # table.indexes is a set; sort it so every process hashes the same DDL
+        ddl.extend(
+            str(CreateIndex(index).compile(dialect=dialect))
+            for index in sorted(table.indexes, key=lambda index: index.name)
+        )
+    return hashlib.sha256("".join(ddl).encode()).hexdigest()[:12]
+
+
+async def _clone_worker_database() -> None:
+    """Copy the worker database from a template holding the current schema"""
+    base_url = _base_test_database_url()
+    template = f"{base_url.database}_template_{_schema_fingerprint()}"
+    worker_database = _test_database_url().database
+
+    # CREATE/DROP DATABASE cannot run inside a transaction
+    maintenance = _create_test_engine(
+        base_url.set(database="postgres"), isolation_level="AUTOCOMMIT"
+    )
+    try:
+        async with maintenance.connect() as connection:
+            # Workers start together; only one builds the template
+            await connection.execute(
+                text("SELECT pg_advisory_lock(hashtext(:name))"), {"name": template}
+            )
+            try:
+                exists = await connection.scalar(
+                    text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                    {"name": template},
+                )
+                if not exists:
+                    # Templates built from an older schema are never used again
+                    stale_templates = await connection.scalars(
+                        text(
+                            "SELECT datname FROM pg_database "
+                            "WHERE starts_with(datname, :prefix) AND datname != :name"
+                        ),
+                        {"prefix": f"{base_url.database}_template_", "name": template},
+                    )
+                    for stale_template in stale_templates.all():
+                        await connection.execute(
+                            text(f'DROP DATABASE IF EXISTS "{stale_template}"')
+                        )
+                    await connection.execute(text(f'CREATE DATABASE "{template}"'))
+                    engine = _create_test_engine(base_url.set(database=template))
+                    try:
+                        async with engine.begin() as template_connection:
+                            await template_connection.run_sync(Base.metadata.create_all)
+                    except Exception:
+                        # Never leave a half-built template for later runs to reuse
+                        await engine.dispose()
+                        await connection.execute(text(f'DROP DATABASE "{template}"'))
+                        raise
+                    await engine.dispose()
+            finally:
+                await connection.execute(
+                    text("SELECT pg_advisory_unlock(hashtext(:name))"), {"name": template}
+                )
+
+            await connection.execute(text(f'DROP DATABASE IF EXISTS "{worker_database}"'))
+            await connection.execute(
+                text(f'CREATE DATABASE "{worker_database}" TEMPLATE "{template}"')
+            )
+    finally:
+        await maintenance.dispose()
+
+
+async def _drop_worker_database() -> None:
+    base_url = _base_test_database_url()
+    maintenance = _create_test_engine(
+        base_url.set(database="postgres"), isolation_level="AUTOCOMMIT"
+    )
+    try:
+        async with maintenance.connect() as connection:
+            await connection.execute(
+                text(f'DROP DATABASE IF EXISTS "{_test_database_url().database}"')
+            )
+    finally:
+        await maintenance.dispose()
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Run every test loop on uvloop when it is installed"""
+    if uvloop is not None and sys.platform != "win32":
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def test_engine():
+    """Create the test database engine once for the whole session"""
+    engine = _create_test_engine()
     yield engine
     await engine.dispose()
 
 
-@pytest_asyncio.fixture(scope="function")
-async def setup_test_db(test_engine):
-    """Set up test database schema for each test"""
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def setup_schema(test_engine):
+    """Create the test database schema once for the whole session"""
+    if _XDIST_WORKER:
+        # Cloning a template is a file copy, far cheaper than replaying DDL
+        await _clone_worker_database()
+        yield
+        await _drop_worker_database()
+        return
+
     async with test_engine.begin() as connection:
         await connection.run_sync(Base.metadata.create_all)
     yield
@@ -46,32 +195,103 @@ async def setup_test_db(test_engine):
 
 @pytest_asyncio.fixture(scope="function")
 async def db_session(
-    test_engine, setup_test_db
+    test_engine, setup_schema
 ) -> AsyncGenerator[AsyncSession, None]:
-    """Create a fresh database session for each test"""
-    connection = await test_engine.connect()
-    transaction = await connection.begin()
+    """Create a database session whose work is rolled back after each test"""
+    # One connection per test, shared by the test body and every request
+    async with test_engine.connect() as connection:
+        transaction = await connection.begin()
 
-    session = AsyncSession(bind=connection, expire_on_commit=False)
+        # Session commits only release SAVEPOINTs; the outer transaction is
+        # rolled back below, so every test starts from the empty schema
+        session = AsyncSession(
+            bind=connection,
+            join_transaction_mode="create_savepoint",
+            expire_on_commit=False,
+        )
 
-    try:
-        yield session
-    finally:
-        await session.close()
-        await transaction.rollback()
-        await connection.close()
+        try:
+            yield session
+        finally:
+            await session.close()
+            await transaction.rollback()
 
 
-@pytest_asyncio.fixture(scope="function")
-async def client(db_session: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
-    async def get_test_db():
-        yield db_session
+@pytest.fixture(autouse=True)
+def clear_plan_cache():
+    """Start every test with an empty plan cache
+
+    The cache is process-global, so plans loaded in one test would outlive
+    that test's rolled-back transaction
+    """
+    SubscriptionService.invalidate_plan_cache()
+    yield
+    SubscriptionService.invalidate_plan_cache()
+
 
-    app.dependency_overrides[get_db] = get_test_db
+@pytest.fixture(scope="function")
+def test_app() -> FastAPI:
+    """A fresh app per test, so dependency overrides never leak between tests"""
+    return create_app()
 
+
+@pytest_asyncio.fixture(scope="function")
+async def api_client(test_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    """HTTP client for tests that mock the database or never touch it"""
     async with AsyncClient(
-        transport=httpx.ASGITransport(app=app), base_url="http://test"
+        transport=httpx.ASGITransport(app=test_app), base_url="http://test"
     ) as ac:
         yield ac
 
-    app.dependency_overrides.clear()
+
+@pytest_asyncio.fixture(scope="function")
+async def client(
+    test_app: FastAPI, api_client: AsyncClient, db_session: AsyncSession
+) -> AsyncClient:
+    """HTTP client whose requests run on the test's database session"""
+    # Requests reuse the test's session and connection instead of opening their own
+    async def get_test_db():
+        yield db_session
+
+    test_app.dependency_overrides[get_db] = get_test_db
+    return api_client
+
+
+@pytest.fixture(scope="session")
+def hashed_testpw() -> str:
+    """bcrypt hash of "testpassword123", computed once per session"""
+    return get_password_hash("testpassword123")
+
+
+@pytest.fixture(scope="session")
+def token_factory() -> Callable[..., str]:
+    """Access tokens memoized by (user_id, organization_id, role)"""
+    tokens: dict[tuple[int, int, str], str] = {}
+
+    def make(user_id: int = 1, organization_id: int = 1, role: str = "owner") -> str:
+        key = (user_id, organization_id, role)
+        if key not in tokens:
+            tokens[key] = create_access_token(
+                user_id=user_id,
+                organization_id=organization_id,
+                email="test@example.com",
+                role=role,
+            )
+        return tokens[key]
+
+    return make
+
+
+@pytest.fixture(scope="session")
+def auth_tokens(token_factory: Callable[..., str]) -> dict[str, str]:
+    """One access/refresh token pair for an owner of organization 1"""
+    return {
+        "access": token_factory(),
+        "refresh": create_refresh_token(user_id=1, organization_id=1),
+    }
+
+
+@pytest.fixture(scope="session")
+def auth_headers(auth_tokens: dict[str, str]) -> dict[str, str]:
+    """Bearer header for requests that only need a valid access token"""
+    return {"Authorization": f"Bearer {auth_tokens['access']}"}
@@ -2,6 +2,8 @@ import pytest
 from datetime import date, timedelta
 from decimal import Decimal
 
+from pydantic import TypeAdapter
+
 from app.schemas.aging_report import (
     AgingBucket,
     AgingSummary,
@@ -16,6 +18,48 @@ from app.schemas.aging_report import (
     AgingTrendsParams,
 )
 
+# One clock read for the whole module, so dates never straddle midnight
+_TODAY = date.today()
+_DAYS_AGO_30 = _TODAY - timedelta(days=30)
+_DAYS_AGO_45 = _TODAY - timedelta(days=45)
+_DAYS_AGO_60 = _TODAY - timedelta(days=60)
+
+# Decimals are immutable, so one zero can be shared by every payload
+_ZERO = Decimal("0.00")
+
+# Flat happy paths use model_construct and only check field round-trips;
+# validation behaviour is covered by the dedicated invalid_* tests and the
+# nested schemas, which go through these adapters or model_validate_json.
+# Built once per module; validate_python skips the BaseModel.__init__ wrapper
+_BUCKET_TA = TypeAdapter(AgingBucket)
+_SUMMARY_TA = TypeAdapter(AgingSummary)
+_INVOICE_DETAIL_TA = TypeAdapter(InvoiceAgingDetail)
+_REPORT_TA = TypeAdapter(AgingReport)
+
+# Payloads as the API would receive them; amounts are strings so they
+# parse to exact Decimals
+_AGING_SUMMARY_JSON = (
+    b'{"current": {"count": 5, "amount": "2500.00"},'
+    b' "days_1_30": {"count": 3, "amount": "1500.00"},'
+    b' "days_31_60": {"count": 2, "amount": "1000.00"},'
+    b' "days_61_90": {"count": 1, "amount": "500.00"},'
+    b' "days_over_90": {"count": 1, "amount": "300.00"},'
+    b' "total": {"count": 12, "amount": "5800.00"}}'
+)
+_AGING_REPORT_JSON = (
+    b'{"report_date": "2024-01-31", "organization_id": 1,'
+    b' "customer_filter": null, "include_paid": false,'
+    b' "summary": ' + _AGING_SUMMARY_JSON + b','
+    b' "customer_summaries": [], "invoice_details": [],'
+    b' "total_customers": 0, "total_invoices": 0}'
+)
+_AGING_TRENDS_JSON = (
+    b'{"trends": [{"report_date": "2024-01-31", "month_year": "2024-01",'
+    b' "summary": ' + _AGING_SUMMARY_JSON + b','
+    b' "total_customers": 5, "total_invoices": 12}],'
+    b' "months_back": 6}'
+)
+
 
 class TestAgingReportSchemas:
     """Test aging report Pydantic schemas"""
@@ -27,7 +71,7 @@ class TestAgingReportSchemas:
             "amount": Decimal("2500.00"),
         }
 
-        bucket = AgingBucket(**bucket_data)
+        bucket = AgingBucket.model_construct(**bucket_data)
         assert bucket.count == 5
         assert bucket.amount == Decimal("2500.00")
 
@@ -39,7 +83,7 @@ class TestAgingReportSchemas:
         }
 
         with pytest.raises(ValueError):
-            AgingBucket(**bucket_data)
+            _BUCKET_TA.validate_python(bucket_data)
 
     def test_aging_summary_schema(self):
         """Test aging summary schema"""
@@ -52,7 +96,7 @@ class TestAgingReportSchemas:
             "total": {"count": 21, "amount": Decimal("10500.00")},
         }
 
-        summary = AgingSummary(**summary_data)
+        summary = _SUMMARY_TA.validate_python(summary_data)
         assert summary.current.count == 10
         assert summary.days_1_30.amount == Decimal("2500.00")
         assert summary.total.count == 21
@@ -72,7 +116,7 @@ class TestAgingReportSchemas:
             "invoice_count": 5,
         }
 
-        customer_summary = CustomerAgingSummary(**customer_data)
+        customer_summary = CustomerAgingSummary.model_construct(**customer_data)
         assert customer_summary.customer_id == 1
         assert customer_summary.customer_name == "John Doe"
         assert customer_summary.total == Decimal("2100.00")
@@ -80,17 +124,14 @@ class TestAgingReportSchemas:
 
     def test_invoice_aging_detail_schema(self):
         """Test invoice aging detail schema"""
-        today = date.today()
-        due_date = today - timedelta(days=45)
-
         invoice_data = {
             "invoice_id": 1,
             "invoice_number": "INV-2024-0001",
             "customer_id": 1,
             "customer_name": "John Doe",
             "company_name": "Test Company",
-            "invoice_date": today - timedelta(days=60),
-            "due_date": due_date,
+            "invoice_date": _DAYS_AGO_60,
+            "due_date": _DAYS_AGO_45,
             "total_amount": Decimal("1000.00"),
             "paid_amount": Decimal("200.00"),
             "outstanding_amount": Decimal("800.00"),
@@ -99,7 +140,7 @@ class TestAgingReportSchemas:
             "status": "sent",
         }
 
-        invoice_detail = InvoiceAgingDetail(**invoice_data)
+        invoice_detail = InvoiceAgingDetail.model_construct(**invoice_data)
         assert invoice_detail.invoice_id == 1
         assert invoice_detail.days_overdue == 45
         assert invoice_detail.aging_bucket == "days_31_60"
@@ -107,17 +148,15 @@ class TestAgingReportSchemas:
 
     def test_invoice_aging_detail_invalid_bucket(self):
         """Test invoice aging detail with invalid aging bucket"""
-        today = date.today()
-
         invoice_data = {
             "invoice_id": 1,
             "invoice_number": "INV-2024-0001",
             "customer_id": 1,
             "customer_name": "John Doe",
-            "invoice_date": today,
-            "due_date": today,
+            "invoice_date": _TODAY,
+            "due_date": _TODAY,
             "total_amount": Decimal("1000.00"),
-            "paid_amount": Decimal("0.00"),
+            "paid_amount": _ZERO,
             "outstanding_amount": Decimal("1000.00"),
             "days_overdue": 0,
             "aging_bucket": "invalid_bucket",  # Invalid bucket
@@ -125,191 +164,111 @@ class TestAgingReportSchemas:
         }
 
         with pytest.raises(ValueError):
-            InvoiceAgingDetail(**invoice_data)
+            _INVOICE_DETAIL_TA.validate_python(invoice_data)
 
     def test_aging_report_schema(self):
-        """Test complete aging report schema"""
-        today = date.today()
-
-        report_data = {
-            "report_date": today,
-            "organization_id": 1,
-            "customer_filter": None,
-            "include_paid": False,
-            "summary": {
-                "current": {"count": 5, "amount": Decimal("2500.00")},
-                "days_1_30": {"count": 3, "amount": Decimal("1500.00")},
-                "days_31_60": {"count": 2, "amount": Decimal("1000.00")},
-                "days_61_90": {"count": 1, "amount": Decimal("500.00")},
-                "days_over_90": {"count": 1, "amount": Decimal("300.00")},
-                "total": {"count": 12, "amount": Decimal("5800.00")},
-            },
-            "customer_summaries": [],
-            "invoice_details": [],
-            "total_customers": 0,
-            "total_invoices": 0,
-        }
-
-        report = AgingReport(**report_data)
-        assert report.report_date == today
+        """Test complete aging report schema parsed straight from JSON"""
+        report = AgingReport.model_validate_json(_AGING_REPORT_JSON)
+        assert report.report_date == date(2024, 1, 31)
         assert report.organization_id == 1
         assert report.summary.total.amount == Decimal("5800.00")
 
     def test_overdue_invoice_schema(self):
         """Test overdue invoice schema"""
-        today = date.today()
-        due_date = today - timedelta(days=30)
-
         overdue_data = {
             "invoice_id": 1,
             "invoice_number": "INV-2024-0001",
             "customer_id": 1,
             "customer_name": "John Doe",
             "company_name": "Test Company",
-            "invoice_date": today - timedelta(days=45),
-            "due_date": due_date,
+            "invoice_date": _DAYS_AGO_45,
+            "due_date": _DAYS_AGO_30,
             "total_amount": Decimal("1000.00"),
-            "paid_amount": Decimal("0.00"),
+            "paid_amount": _ZERO,
             "outstanding_amount": Decimal("1000.00"),
             "days_overdue": 30,
             "status": "overdue",
         }
 
-        overdue_invoice = OverdueInvoice(**overdue_data)
+        overdue_invoice = OverdueInvoice.model_construct(**overdue_data)
         assert overdue_invoice.invoice_id == 1
         assert overdue_invoice.days_overdue == 30
         assert overdue_invoice.outstanding_amount == Decimal("1000.00")
 
     def test_aging_trends_schema(self):
-        """Test aging trends schema"""
-        today = date.today()
-
-        trends_data = {
-            "trends": [
-                {
-                    "report_date": today,
-                    "month_year": "2024-01",
-                    "summary": {
-                        "current": {"count": 5, "amount": Decimal("2500.00")},
-                        "days_1_30": {"count": 3, "amount": Decimal("1500.00")},
-                        "days_31_60": {
-                            "count": 2,
-                            "amount": Decimal("1000.00"),
-                        },
-                        "days_61_90": {"count": 1, "amount": Decimal("500.00")},
-                        "days_over_90": {
-                            "count": 1,
-                            "amount": Decimal("300.00"),
-                        },
-                        "total": {"count": 12, "amount": Decimal("5800.00")},
-                    },
-                    "total_customers": 5,
-                    "total_invoices": 12,
-                }
-            ],
-            "months_back": 6,
-        }
-
-        trends = AgingTrends(**trends_data)
+        """Test aging trends schema parsed straight from JSON"""
+        trends = AgingTrends.model_validate_json(_AGING_TRENDS_JSON)
         assert trends.months_back == 6
         assert len(trends.trends) == 1
         assert trends.trends[0].total_customers == 5
+        assert trends.trends[0].summary.days_31_60.amount == Decimal("1000.00")
 
 
 class TestAgingReportBusinessLogic:
     """Test aging report business logic without database"""
 
-    def test_aging_bucket_calculation(self):
+    @pytest.mark.parametrize(
+        "days_overdue,expected_bucket",
+        [
+            (-5, "current"),  # Future due date
+            (0, "current"),  # Due today
+            (15, "days_1_30"),
+            (30, "days_1_30"),
+            (31, "days_31_60"),
+            (45, "days_31_60"),
+            (60, "days_31_60"),
+            (75, "days_61_90"),
+            (90, "days_61_90"),
+            (91, "days_over_90"),
+            (120, "days_over_90"),
+        ],
+    )
+    def test_aging_bucket_calculation(self, days_overdue, expected_bucket):
         """Test aging bucket calculation logic"""
-        today = date.today()
-
-        # Test different aging scenarios
-        test_cases = [
-            (today + timedelta(days=5), "current"),  # Future due date
-            (today, "current"),  # Due today
-            (today - timedelta(days=15), "days_1_30"),  # 15 days overdue
-            (today - timedelta(days=30), "days_1_30"),  # 30 days overdue
-            (today - timedelta(days=45), "days_31_60"),  # 45 days overdue
-            (today - timedelta(days=60), "days_31_60"),  # 60 days overdue
-            (today - timedelta(days=75), "days_61_90"),  # 75 days overdue
-            (today - timedelta(days=90), "days_61_90"),  # 90 days overdue
-            (today - timedelta(days=120), "days_over_90"),  # 120 days overdue
-        ]
-
-        for due_date, expected_bucket in test_cases:
-            days_overdue = (today - due_date).days
-
-            if days_overdue <= 0:
-                bucket = "current"
-            elif days_overdue <= 30:
-                bucket = "days_1_30"
-            elif days_overdue <= 60:
-                bucket = "days_31_60"
-            elif days_overdue <= 90:
-                bucket = "days_61_90"
-            else:
-                bucket = "days_over_90"
+        from app.services.aging_report_service import AgingReportService
 
-            assert bucket == expected_bucket, (
-                f"Failed for due_date {due_date}, days_overdue {days_overdue}"
-            )
+        assert AgingReportService._get_aging_bucket(days_overdue) == expected_bucket
 
     def test_aging_summary_calculation(self):
         """Test aging summary calculation logic"""
-        # Mock invoice data
-        invoices = [
-            {
-                "outstanding": Decimal("1000.00"),
-                "days_overdue": -5,
-                "bucket": "current",
-            },
-            {
-                "outstanding": Decimal("500.00"),
-                "days_overdue": 15,
-                "bucket": "days_1_30",
-            },
-            {
-                "outstanding": Decimal("750.00"),
-                "days_overdue": 45,
-                "bucket": "days_31_60",
-            },
-            {
-                "outstanding": Decimal("300.00"),
-                "days_overdue": 75,
-                "bucket": "days_61_90",
-            },
-            {
-                "outstanding": Decimal("200.00"),
-                "days_overdue": 120,
-                "bucket": "days_over_90",
-            },
+        from app.services.aging_report_service import _summarize_aging
+
+        # Invoices as parallel columns: bucket index and outstanding amount
+        bucket_indexes = [0, 1, 2, 3, 4, 0]
+        amounts = [
+            Decimal("1000.00"),
+            Decimal("500.00"),
+            Decimal("750.00"),
+            Decimal("300.00"),
+            Decimal("200.00"),
+            Decimal("250.00"),
         ]
 
-        # Calculate summary
-        summary = {
-            "current": {"count": 0, "amount": Decimal("0.00")},
-            "days_1_30": {"count": 0, "amount": Decimal("0.00")},
-            "days_31_60": {"count": 0, "amount": Decimal("0.00")},
-            "days_61_90": {"count": 0, "amount": Decimal("0.00")},
-            "days_over_90": {"count": 0, "amount": Decimal("0.00")},
-            "total": {"count": 0, "amount": Decimal("0.00")},
-        }
-
-        for invoice in invoices:
-            bucket = invoice["bucket"]
-            amount = invoice["outstanding"]
-
-            summary[bucket]["count"] += 1
-            summary[bucket]["amount"] += amount
-            summary["total"]["count"] += 1
-            summary["total"]["amount"] += amount
+        summary = _summarize_aging(bucket_indexes, amounts)
 
         # Verify calculations
-        assert summary["current"]["count"] == 1
-        assert summary["current"]["amount"] == Decimal("1000.00")
+        assert summary["current"]["count"] == 2
+        assert summary["current"]["amount"] == Decimal("1250.00")
         assert summary["days_1_30"]["amount"] == Decimal("500.00")
-        assert summary["total"]["count"] == 5
-        assert summary["total"]["amount"] == Decimal("2750.00")
+        assert summary["days_over_90"]["count"] == 1
+        assert summary["total"]["count"] == 6
+        assert summary["total"]["amount"] == Decimal("3000.00")
+
+    def test_aging_summary_calculation_empty(self):
+        """Test an empty aging summary still lists every bucket"""
+        from app.services.aging_report_service import _summarize_aging
+
+        summary = _summarize_aging([], [])
+
+        assert list(summary) == [
+            "current",
+            "days_1_30",
+            "days_31_60",
+            "days_61_90",
+            "days_over_90",
+            "total",
+        ]
+        assert summary["total"] == {"count": 0, "amount": _ZERO}
 
     def test_overdue_percentage_calculation(self):
         """Test overdue percentage calculation"""
@@ -336,28 +295,21 @@ class TestAgingReportBusinessLogic:
 
     def test_weighted_average_days_calculation(self):
         """Test weighted average days outstanding calculation"""
+        from app.services.aging_report_service import AgingReportService
+
         invoices = [
-            {"outstanding": Decimal("1000.00"), "days_overdue": 10},
-            {"outstanding": Decimal("2000.00"), "days_overdue": 30},
-            {"outstanding": Decimal("500.00"), "days_overdue": 60},
+            {"outstanding_amount": Decimal("1000.00"), "days_overdue": 10},
+            {"outstanding_amount": Decimal("2000.00"), "days_overdue": 30},
+            {"outstanding_amount": Decimal("500.00"), "days_overdue": 60},
+            {"outstanding_amount": _ZERO, "days_overdue": 400},  # Ignored
         ]
 
-        total_weighted_days = 0
-        total_amount = 0
-
-        for invoice in invoices:
-            amount = float(invoice["outstanding"])
-            days = invoice["days_overdue"]
-            total_weighted_days += days * amount
-            total_amount += amount
-
-        average_days = (
-            total_weighted_days / total_amount if total_amount > 0 else 0
-        )
+        average_days = AgingReportService.average_days_outstanding(invoices)
 
         # Expected: (10*1000 + 30*2000 + 60*500) / 3500 = 100000 / 3500 = 28.57
         expected_average = (10 * 1000 + 30 * 2000 + 60 * 500) / 3500
         assert abs(average_days - expected_average) < 0.01
+        assert AgingReportService.average_days_outstanding([]) == 0.0
 
     def test_customer_risk_assessment(self):
         """Test customer risk assessment logic"""
@@ -376,8 +328,8 @@ class TestAgingReportBusinessLogic:
             },
             {
                 "name": "Customer C",
-                "days_61_90": Decimal("0.00"),
-                "days_over_90": Decimal("0.00"),
+                "days_61_90": _ZERO,
+                "days_over_90": _ZERO,
                 "total": Decimal("2000.00"),
             },
         ]
@@ -420,6 +372,14 @@ class TestAgingReportService:
         assert hasattr(AgingReportService, "_get_outstanding_invoices")
 
 
+@pytest.fixture(scope="module")
+def aging_routes():
+    """Paths registered on the reports router"""
+    from app.api.v1.reports import router
+
+    return frozenset(route.path for route in router.routes)
+
+
 class TestAgingReportAPI:
     """Test aging report API endpoints"""
 
@@ -429,19 +389,20 @@ class TestAgingReportAPI:
 
         assert router is not None
 
-    def test_aging_report_api_endpoints_exist(self):
+    def test_aging_report_api_endpoints_exist(self, aging_routes):
         """Test that aging report API endpoints are defined"""
-        from app.api.v1.reports import router
+        expected = {
+            "/aging",
+            "/aging/summary",
+            "/aging/overdue",
+            "/aging/trends",
+            "/aging/metrics",
+            "/aging/alerts",
+            "/aging/dashboard",
+        }
 
-        # Check that aging routes exist
-        routes = [route.path for route in router.routes]
-        assert "/aging" in routes
-        assert "/aging/summary" in routes
-        assert "/aging/overdue" in routes
-        assert "/aging/trends" in routes
-        assert "/aging/metrics" in routes
-        assert "/aging/alerts" in routes
-        assert "/aging/dashboard" in routes
+        # Report every missing route at once
+        assert expected - aging_routes == set()
 
     def test_aging_report_api_methods(self):
         """Test that aging report API has correct HTTP methods"""
@@ -461,35 +422,25 @@ class TestAgingReportAPI:
         from app.api.v1.api import api_router
 
         # Check that report routes are included
-        report_routes_found = False
-        for route in api_router.routes:
-            if hasattr(route, "path_regex") and "reports" in str(
-                route.path_regex
-            ):
-                report_routes_found = True
-                break
-
-        assert report_routes_found, "Report routes not found in main API router"
+        assert any(
+            route.path.startswith("/reports/") for route in api_router.routes
+        ), "Report routes not found in main API router"
 
     def test_aging_schemas_integration(self):
         """Test that aging schemas work with API"""
-        from app.schemas.aging_report import AgingReport, AgingReportParams
-
         # Test that schemas can be used for API serialization
-        today = date.today()
-
         report_data = {
-            "report_date": today,
+            "report_date": _TODAY,
             "organization_id": 1,
             "customer_filter": None,
             "include_paid": False,
             "summary": {
-                "current": {"count": 0, "amount": Decimal("0.00")},
-                "days_1_30": {"count": 0, "amount": Decimal("0.00")},
-                "days_31_60": {"count": 0, "amount": Decimal("0.00")},
-                "days_61_90": {"count": 0, "amount": Decimal("0.00")},
-                "days_over_90": {"count": 0, "amount": Decimal("0.00")},
-                "total": {"count": 0, "amount": Decimal("0.00")},
+                "current": {"count": 0, "amount": _ZERO},
+                "days_1_30": {"count": 0, "amount": _ZERO},
+                "days_31_60": {"count": 0, "amount": _ZERO},
+                "days_61_90": {"count": 0, "amount": _ZERO},
+                "days_over_90": {"count": 0, "amount": _ZERO},
+                "total": {"count": 0, "amount": _ZERO},
             },
             "customer_summaries": [],
             "invoice_details": [],
@@ -498,5 +449,37 @@ class TestAgingReportAPI:
         }
 
         # Should be able to create and validate
-        aging_report = AgingReport(**report_data)
+        aging_report = _REPORT_TA.validate_python(report_data)
         assert aging_report.organization_id == 1
+
+    @pytest.mark.asyncio
+    async def test_aging_report_service_output_matches_response_model(self):
+        """Test the service dict validates as the /aging response as-is"""
+        from types import SimpleNamespace
+        from unittest.mock import AsyncMock
+
+        from app.services.aging_report_service import AgingReportService
+
+        invoice = SimpleNamespace(
+            id=1,
+            invoice_number="INV-2024-0001",
+            customer_id=1,
+            customer=None,
+            invoice_date=_DAYS_AGO_60,
+            due_date=_DAYS_AGO_45,
+            total_amount=Decimal("1000.00"),
+            paid_amount=Decimal("200.00"),
+            status="sent",
+        )
+        service = AgingReportService(db=None)
+        service._get_outstanding_invoices = AsyncMock(return_value=[invoice])
+
+        report = await service.generate_aging_report(
+            organization_id=1, as_of_date=_TODAY
+        )
+
+        # The endpoint returns this dict and lets response_model validate it
+        aging_report = _REPORT_TA.validate_python(report)
+        assert aging_report.summary.days_31_60.amount == Decimal("800.00")
+        assert aging_report.invoice_details[0].aging_bucket == "days_31_60"
+        assert aging_report.customer_summaries[0].invoice_count == 1
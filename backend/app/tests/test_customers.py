@@ -1,6 +1,10 @@
+from datetime import datetime
+from types import MappingProxyType, SimpleNamespace
+
 import pytest
+from jose import jwt
+from pydantic import TypeAdapter, ValidationError
 
-from app.core.security import create_access_token, UserRole
 from app.schemas.customer import (
     CustomerCreate,
     CustomerUpdate,
@@ -9,63 +13,86 @@ from app.schemas.customer import (
     CustomerListResponse,
 )
 
+_CUSTOMER_CREATE_TA = TypeAdapter(CustomerCreate)
+
+# Fixed timestamp for response schemas, so runs are reproducible
+_NOW = datetime(2024, 1, 1)
+
+# Longest customer_code and name CustomerCreate accepts
+_MAX_CODE = "A" * 50
+_MAX_NAME = "A" * 255
+
+# Smallest valid CustomerCreate payload; field tests override one key at a time
+_CUSTOMER_BASE = MappingProxyType({
+    "customer_code": "CUST001",
+    "name": "John Doe",
+    "status": "active",
+})
+
 
 class TestCustomerSchemas:
     """Test customer Pydantic schemas"""
 
     def test_customer_create_valid(self):
         """Test valid customer creation schema"""
-        customer_data = {
-            "customer_code": "CUST001",
-            "name": "John Doe",
-            "email": "john@example.com",
-            "phone": "123-456-7890",
-            "billing_address": "123 Main St",
-            "shipping_address": "123 Main St",
-            "credit_limit": 5000.0,
-            "payment_terms": 30,
-            "tax_id": "TAX123",
-            "status": "active",
-        }
+        customer_data = dict(
+            _CUSTOMER_BASE,
+            email="john@example.com",
+            phone="123-456-7890",
+            billing_address="123 Main St",
+            shipping_address="123 Main St",
+            credit_limit=5000.0,
+            payment_terms=30,
+            tax_id="TAX123",
+        )
 
-        customer = CustomerCreate(**customer_data)
+        customer = _CUSTOMER_CREATE_TA.validate_python(customer_data)
         assert customer.customer_code == "CUST001"
         assert customer.name == "John Doe"
         assert customer.email == "john@example.com"
         assert customer.status == "active"
 
-    def test_customer_create_invalid_email(self):
-        """Test customer creation with invalid email"""
-        customer_data = {
-            "customer_code": "CUST001",
-            "name": "John Doe",
-            "email": "invalid-email",
-            "status": "active",
-        }
-
-        with pytest.raises(ValueError):
-            CustomerCreate(**customer_data)
-
-    def test_customer_create_invalid_status(self):
-        """Test customer creation with invalid status"""
-        customer_data = {
-            "customer_code": "CUST001",
-            "name": "John Doe",
-            "status": "invalid_status",
-        }
-
-        with pytest.raises(ValueError):
-            CustomerCreate(**customer_data)
+    @pytest.mark.parametrize(
+        "field,value,should_raise",
+        [
+            ("email", "invalid-email", True),
+            ("status", "invalid_status", True),
+            ("payment_terms", 30, False),
+            ("payment_terms", -1, True),
+            ("payment_terms", 400, True),  # Max is 365
+            ("credit_limit", 10000.0, False),
+            ("credit_limit", -1000.0, True),
+            ("customer_code", None, True),
+            ("customer_code", "", True),
+            ("customer_code", _MAX_CODE, False),
+            ("customer_code", _MAX_CODE + "A", True),
+            ("name", _MAX_NAME, False),
+            ("name", _MAX_NAME + "A", True),
+        ],
+    )
+    def test_customer_create_field(self, field, value, should_raise):
+        """Test CustomerCreate validation one field at a time"""
+        data = {**_CUSTOMER_BASE, field: value}
+        if not should_raise:
+            customer = _CUSTOMER_CREATE_TA.validate_python(data)
+            assert getattr(customer, field) == value
+            return
+
+        with pytest.raises(ValidationError) as exc_info:
+            _CUSTOMER_CREATE_TA.validate_python(data)
+        # The error must come from the field under test, not the base payload
+        assert [error["loc"] for error in exc_info.value.errors()] == [(field,)]
 
     def test_customer_create_missing_required_fields(self):
         """Test customer creation with missing required fields"""
         customer_data = {
-            "name": "John Doe"
-            # Missing customer_code
+            key: value
+            for key, value in _CUSTOMER_BASE.items()
+            if key != "customer_code"
         }
 
-        with pytest.raises(ValueError):
-            CustomerCreate(**customer_data)
+        with pytest.raises(ValidationError):
+            _CUSTOMER_CREATE_TA.validate_python(customer_data)
 
     def test_customer_update_partial(self):
         """Test customer update with partial data"""
@@ -81,8 +108,6 @@ class TestCustomerSchemas:
 
     def test_customer_response_schema(self):
         """Test customer response schema"""
-        from datetime import datetime
-
         response_data = {
             "id": 1,
             "organization_id": 1,
@@ -96,8 +121,8 @@ class TestCustomerSchemas:
             "payment_terms": 30,
             "tax_id": "TAX123",
             "status": "active",
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
+            "created_at": _NOW,
+            "updated_at": _NOW,
         }
 
         customer_response = CustomerResponse(**response_data)
@@ -130,20 +155,18 @@ class TestCustomerSchemas:
         """Test customer search with invalid status"""
         invalid_params = {"status": "invalid_status"}
 
-        with pytest.raises(ValueError):
+        with pytest.raises(ValidationError):
             CustomerSearchParams(**invalid_params)
 
     def test_customer_search_params_invalid_sort_order(self):
         """Test customer search with invalid sort order"""
         invalid_params = {"sort_order": "invalid_order"}
 
-        with pytest.raises(ValueError):
+        with pytest.raises(ValidationError):
             CustomerSearchParams(**invalid_params)
 
     def test_customer_list_response_schema(self):
         """Test customer list response schema"""
-        from datetime import datetime
-
         customer_data = {
             "id": 1,
             "organization_id": 1,
@@ -157,8 +180,8 @@ class TestCustomerSchemas:
             "payment_terms": 30,
             "tax_id": "TAX123",
             "status": "active",
-            "created_at": datetime.now(),
-            "updated_at": datetime.now(),
+            "created_at": _NOW,
+            "updated_at": _NOW,
         }
 
         list_response_data = {
@@ -179,155 +202,79 @@ class TestCustomerSchemas:
 class TestCustomerBusinessLogic:
     """Test customer business logic without database"""
 
-    def create_test_token(
-        self, user_id: int = 1, organization_id: int = 1, role: str = "owner"
-    ):
-        """Helper to create test JWT token"""
-        return create_access_token(
-            user_id=user_id,
-            organization_id=organization_id,
-            email="test@example.com",
-            role=role,
-        )
-
-    def test_jwt_token_creation(self):
+    def test_jwt_token_creation(self, auth_tokens):
         """Test JWT token creation for customer API"""
-        token = self.create_test_token(
-            user_id=1, organization_id=1, role="owner"
-        )
+        token = auth_tokens["access"]
         assert token is not None
         assert isinstance(token, str)
         assert len(token) > 0
 
-    def test_jwt_token_different_organizations(self):
+    def test_jwt_token_different_organizations(self, token_factory):
         """Test JWT tokens for different organizations"""
-        token_org1 = self.create_test_token(user_id=1, organization_id=1)
-        token_org2 = self.create_test_token(user_id=2, organization_id=2)
+        token_org1 = token_factory(user_id=1, organization_id=1)
+        token_org2 = token_factory(user_id=2, organization_id=2)
 
         assert token_org1 != token_org2
 
-        # Verify token contents
-        from app.core.security import verify_token
-
-        payload1 = verify_token(token_org1)
-        payload2 = verify_token(token_org2)
+        # Signature checks are covered by the auth tests, only read the claims
+        payload1 = jwt.get_unverified_claims(token_org1)
+        payload2 = jwt.get_unverified_claims(token_org2)
 
         assert payload1["organization_id"] == 1
         assert payload2["organization_id"] == 2
         assert payload1["sub"] == "1"
         assert payload2["sub"] == "2"
 
-    def test_customer_validation_rules(self):
-        """Test customer validation business rules"""
-        # Test payment terms validation
-        valid_customer = CustomerCreate(
-            customer_code="VALID001",
-            name="Valid Customer",
-            payment_terms=30,
-            status="active",
-        )
-        assert valid_customer.payment_terms == 30
-
-        # Test invalid payment terms (negative)
-        with pytest.raises(ValueError):
-            CustomerCreate(
-                customer_code="INVALID001",
-                name="Invalid Customer",
-                payment_terms=-1,
-                status="active",
-            )
-
-        # Test invalid payment terms (too high)
-        with pytest.raises(ValueError):
-            CustomerCreate(
-                customer_code="INVALID002",
-                name="Invalid Customer",
-                payment_terms=400,  # Max is 365
-                status="active",
-            )
-
-    def test_customer_credit_limit_validation(self):
-        """Test customer credit limit validation"""
-        # Valid credit limit
-        valid_customer = CustomerCreate(
-            customer_code="CREDIT001",
-            name="Credit Customer",
-            credit_limit=10000.0,
-            status="active",
-        )
-        assert valid_customer.credit_limit == 10000.0
-
-        # Invalid credit limit (negative)
-        with pytest.raises(ValueError):
-            CustomerCreate(
-                customer_code="CREDIT002",
-                name="Invalid Credit Customer",
-                credit_limit=-1000.0,
-                status="active",
-            )
-
-    def test_customer_field_length_validation(self):
-        """Test customer field length validation"""
-        # Test customer_code max length
-        with pytest.raises(ValueError):
-            CustomerCreate(
-                customer_code="A" * 51,  # Max is 50
-                name="Test Customer",
-                status="active",
-            )
-
-        # Test name max length
-        with pytest.raises(ValueError):
-            CustomerCreate(
-                customer_code="LONG001",
-                name="A" * 256,  # Max is 255
-                status="active",
-            )
+
+@pytest.fixture(scope="module")
+def customer_router():
+    """The customer router, imported on first use by this module's tests"""
+    from app.api.v1.customers import router
+
+    return router
+
+
+@pytest.fixture(scope="module")
+def customer_router_meta(customer_router):
+    """Paths, methods and dependency counts of the customer router, read once"""
+    routes = customer_router.routes
+    return SimpleNamespace(
+        paths=frozenset(route.path for route in routes),
+        methods=frozenset(
+            method
+            for route in routes
+            if hasattr(route, "methods")
+            for method in route.methods
+        ),
+        dependency_counts=[
+            len(route.dependant.dependencies)
+            for route in routes
+            if getattr(route, "dependant", None)
+        ],
+    )
 
 
 class TestCustomerAPIStructure:
     """Test customer API structure and imports"""
 
-    def test_customer_api_import(self):
+    def test_customer_api_import(self, customer_router):
         """Test that customer API can be imported successfully"""
-        from app.api.v1.customers import router
+        assert customer_router is not None
 
-        assert router is not None
-
-    def test_customer_api_routes_exist(self):
+    def test_customer_api_routes_exist(self, customer_router_meta):
         """Test that customer API routes are properly defined"""
-        from app.api.v1.customers import router
-
-        # Check that routes are defined
-        routes = [route.path for route in router.routes]
-        assert "/" in routes  # List/Create customers
-        assert "/{customer_id}" in routes  # Get/Update/Delete customer
+        assert "/" in customer_router_meta.paths  # List/Create customers
+        assert "/{customer_id}" in customer_router_meta.paths  # Get/Update/Delete customer
 
-    def test_customer_api_methods(self):
+    def test_customer_api_methods(self, customer_router_meta):
         """Test that customer API has correct HTTP methods"""
-        from app.api.v1.customers import router
-
-        # Get all route methods
-        all_methods = []
-        for route in router.routes:
-            if hasattr(route, "methods"):
-                all_methods.extend(route.methods)
-
         # Check that CRUD methods are available
-        assert "GET" in all_methods
-        assert "POST" in all_methods
-        assert "PUT" in all_methods
-        assert "DELETE" in all_methods
+        assert {"GET", "POST", "PUT", "DELETE"} <= customer_router_meta.methods
 
-    def test_customer_api_dependencies(self):
+    def test_customer_api_dependencies(self, customer_router_meta):
         """Test that customer API has proper dependencies"""
-        from app.api.v1.customers import router
-
-        # Check that routes have dependencies (authentication)
-        for route in router.routes:
-            if hasattr(route, "dependant") and route.dependant:
-                # Should have dependencies for authentication
-                assert len(route.dependant.dependencies) > 0
+        # Every route should have dependencies for authentication
+        assert all(count > 0 for count in customer_router_meta.dependency_counts)
 
 
 class TestCustomerAPIIntegration:
@@ -338,32 +285,16 @@ class TestCustomerAPIIntegration:
         from app.api.v1.api import api_router
 
         # Check that customer routes are included
-        customer_routes_found = False
-        for route in api_router.routes:
-            if hasattr(route, "path_regex") and "customers" in str(
-                route.path_regex
-            ):
-                customer_routes_found = True
-                break
-
-        assert customer_routes_found, (
-            "Customer routes not found in main API router"
-        )
+        assert any(
+            route.path.startswith("/customers/") for route in api_router.routes
+        ), "Customer routes not found in main API router"
 
     def test_customer_schemas_integration(self):
         """Test that customer schemas work with API"""
-        from app.schemas.customer import CustomerCreate, CustomerResponse
-
         # Test that schemas can be used for API serialization
-        customer_data = {
-            "customer_code": "TEST001",
-            "name": "Test Customer",
-            "status": "active",
-        }
-
         # Should be able to create and validate
-        customer_create = CustomerCreate(**customer_data)
-        assert customer_create.customer_code == "TEST001"
+        customer_create = CustomerCreate(**_CUSTOMER_BASE)
+        assert customer_create.customer_code == "CUST001"
 
     def test_customer_model_integration(self):
         """Test that customer model can be imported and used"""
@@ -1,6 +1,11 @@
+import heapq
 import pytest
+from collections import Counter, defaultdict
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+from operator import itemgetter
+
+from pydantic import TypeAdapter
 
 from app.schemas.dashboard import (
     DateRange,
@@ -10,7 +15,6 @@ from app.schemas.dashboard import (
     PaymentMethodBreakdown,
     PaymentMetrics,
     CustomerMetrics,
-    AgingBucketMetrics,
     AgingMetrics,
     RecentActivity,
     TopCustomer,
@@ -19,28 +23,31 @@ from app.schemas.dashboard import (
     KPISummary,
     QuickStats,
 )
-
-
-class TestDashboardSchemas:
-    """Test dashboard Pydantic schemas"""
-
-    def test_date_range_schema(self):
-        """Test date range schema"""
-        today = date.today()
-        yesterday = today - timedelta(days=1)
-
-        date_range_data = {
-            "from": yesterday,
-            "to": today,
-        }
-
-        date_range = DateRange(**date_range_data)
-        assert date_range.from_date == yesterday
-        assert date_range.to == today
-
-    def test_revenue_metrics_schema(self):
-        """Test revenue metrics schema"""
-        revenue_data = {
+from app.services.dashboard_service import DashboardService, _percentage
+
+# Built once per module for the schemas with nested breakdown models;
+# validate_python skips the BaseModel.__init__ wrapper
+_INVOICE_METRICS_TA = TypeAdapter(InvoiceMetrics)
+_PAYMENT_METRICS_TA = TypeAdapter(PaymentMetrics)
+_AGING_METRICS_TA = TypeAdapter(AgingMetrics)
+
+# Fixed clock, so payloads are identical on every run
+_TODAY = date(2024, 1, 1)
+_YESTERDAY = _TODAY - timedelta(days=1)
+_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+# (schema, payload, fields to check) for the flat schemas, which only need
+# a validation round-trip
+_SCHEMA_CASES = [
+    pytest.param(
+        DateRange,
+        {"from": _YESTERDAY, "to": _TODAY},
+        {"from_date": _YESTERDAY, "to": _TODAY},
+        id="date_range",
+    ),
+    pytest.param(
+        RevenueMetrics,
+        {
             "total_revenue": Decimal("50000.00"),
             "invoice_count": 25,
             "average_invoice_value": Decimal("2000.00"),
@@ -48,23 +55,106 @@ class TestDashboardSchemas:
             "outstanding_count": 8,
             "revenue_growth_percentage": 15.5,
             "previous_period_revenue": Decimal("43478.26"),
-        }
-
-        revenue_metrics = RevenueMetrics(**revenue_data)
-        assert revenue_metrics.total_revenue == Decimal("50000.00")
-        assert revenue_metrics.invoice_count == 25
-        assert revenue_metrics.revenue_growth_percentage == 15.5
+        },
+        {
+            "total_revenue": Decimal("50000.00"),
+            "invoice_count": 25,
+            "revenue_growth_percentage": 15.5,
+        },
+        id="revenue_metrics",
+    ),
+    pytest.param(
+        StatusBreakdown,
+        {"count": 10, "amount": Decimal("5000.00")},
+        {"count": 10, "amount": Decimal("5000.00")},
+        id="status_breakdown",
+    ),
+    pytest.param(
+        CustomerMetrics,
+        {
+            "total_customers": 50,
+            "active_customers": 45,
+            "inactive_customers": 5,
+            "customers_with_outstanding": 12,
+        },
+        {
+            "total_customers": 50,
+            "active_customers": 45,
+            "customers_with_outstanding": 12,
+        },
+        id="customer_metrics",
+    ),
+    pytest.param(
+        RecentActivity,
+        {
+            "type": "invoice",
+            "id": 123,
+            "description": "Invoice INV-2024-0001 created",
+            "amount": Decimal("1500.00"),
+            "date": _NOW,
+            "status": "sent",
+        },
+        {"type": "invoice", "id": 123, "amount": Decimal("1500.00")},
+        id="recent_activity",
+    ),
+    pytest.param(
+        TopCustomer,
+        {
+            "customer_id": 1,
+            "name": "John Doe",
+            "company_name": "Acme Corp",
+            "total_revenue": Decimal("15000.00"),
+            "invoice_count": 8,
+            "outstanding_amount": Decimal("2500.00"),
+        },
+        {
+            "customer_id": 1,
+            "name": "John Doe",
+            "total_revenue": Decimal("15000.00"),
+        },
+        id="top_customer",
+    ),
+    pytest.param(
+        KPISummary,
+        {
+            "total_revenue": Decimal("100000.00"),
+            "outstanding_amount": Decimal("25000.00"),
+            "overdue_amount": Decimal("8000.00"),
+            "collection_efficiency": 75.5,
+            "revenue_growth": 12.3,
+            "total_customers": 150,
+            "active_invoices": 45,
+            "overdue_invoices": 8,
+        },
+        {
+            "total_revenue": Decimal("100000.00"),
+            "collection_efficiency": 75.5,
+            "total_customers": 150,
+        },
+        id="kpi_summary",
+    ),
+    pytest.param(
+        QuickStats,
+        {
+            "total_revenue_this_month": Decimal("25000.00"),
+            "total_outstanding": Decimal("15000.00"),
+            "overdue_amount": Decimal("5000.00"),
+            "total_customers": 75,
+            "invoices_this_month": 20,
+            "payments_this_month": 15,
+        },
+        {
+            "total_revenue_this_month": Decimal("25000.00"),
+            "total_customers": 75,
+            "invoices_this_month": 20,
+        },
+        id="quick_stats",
+    ),
+]
 
-    def test_status_breakdown_schema(self):
-        """Test status breakdown schema"""
-        status_data = {
-            "count": 10,
-            "amount": Decimal("5000.00"),
-        }
 
-        status_breakdown = StatusBreakdown(**status_data)
-        assert status_breakdown.count == 10
-        assert status_breakdown.amount == Decimal("5000.00")
+class TestDashboardSchemas:
+    """Test dashboard Pydantic schemas"""
 
     def test_invoice_metrics_schema(self):
         """Test invoice metrics schema"""
@@ -78,7 +168,7 @@ class TestDashboardSchemas:
             "overdue_amount": Decimal("1500.00"),
         }
 
-        invoice_metrics = InvoiceMetrics(**invoice_data)
+        invoice_metrics = _INVOICE_METRICS_TA.validate_python(invoice_data)
         assert invoice_metrics.overdue_count == 3
         assert invoice_metrics.status_breakdown["sent"].count == 10
 
@@ -95,25 +185,11 @@ class TestDashboardSchemas:
             },
         }
 
-        payment_metrics = PaymentMetrics(**payment_data)
+        payment_metrics = _PAYMENT_METRICS_TA.validate_python(payment_data)
         assert payment_metrics.payment_count == 15
         assert payment_metrics.total_payments == Decimal("12000.00")
         assert payment_metrics.method_breakdown["bank_transfer"].count == 8
 
-    def test_customer_metrics_schema(self):
-        """Test customer metrics schema"""
-        customer_data = {
-            "total_customers": 50,
-            "active_customers": 45,
-            "inactive_customers": 5,
-            "customers_with_outstanding": 12,
-        }
-
-        customer_metrics = CustomerMetrics(**customer_data)
-        assert customer_metrics.total_customers == 50
-        assert customer_metrics.active_customers == 45
-        assert customer_metrics.customers_with_outstanding == 12
-
     def test_aging_metrics_schema(self):
         """Test aging metrics schema"""
         aging_data = {
@@ -127,97 +203,37 @@ class TestDashboardSchemas:
                 "days_31_60": {"count": 3, "amount": Decimal("2500.00")},
                 "days_61_90": {"count": 2, "amount": Decimal("1000.00")},
                 "days_over_90": {"count": 1, "amount": Decimal("500.00")},
+                "total": {"count": 21, "amount": Decimal("25000.00")},
             },
         }
 
-        aging_metrics = AgingMetrics(**aging_data)
+        aging_metrics = _AGING_METRICS_TA.validate_python(aging_data)
         assert aging_metrics.total_outstanding == Decimal("25000.00")
         assert aging_metrics.overdue_percentage == 32.0
-        assert aging_metrics.aging_breakdown["current"].count == 10
-
-    def test_recent_activity_schema(self):
-        """Test recent activity schema"""
-        now = datetime.now()
-
-        activity_data = {
-            "type": "invoice",
-            "id": 123,
-            "description": "Invoice INV-2024-0001 created",
-            "amount": Decimal("1500.00"),
-            "date": now,
-            "status": "sent",
-        }
-
-        activity = RecentActivity(**activity_data)
-        assert activity.type == "invoice"
-        assert activity.id == 123
-        assert activity.amount == Decimal("1500.00")
+        assert aging_metrics.aging_breakdown.current.count == 10
+        # Same JSON shape as the service's summary dict
+        assert aging_metrics.model_dump()["aging_breakdown"] == aging_data["aging_breakdown"]
 
     def test_recent_activity_invalid_type(self):
         """Test recent activity with invalid type"""
-        now = datetime.now()
-
         activity_data = {
             "type": "invalid_type",  # Must be invoice or payment
             "id": 123,
             "description": "Test activity",
             "amount": Decimal("100.00"),
-            "date": now,
+            "date": _NOW,
             "status": "active",
         }
 
         with pytest.raises(ValueError):
             RecentActivity(**activity_data)
 
-    def test_top_customer_schema(self):
-        """Test top customer schema"""
-        customer_data = {
-            "customer_id": 1,
-            "name": "John Doe",
-            "company_name": "Acme Corp",
-            "total_revenue": Decimal("15000.00"),
-            "invoice_count": 8,
-            "outstanding_amount": Decimal("2500.00"),
-        }
-
-        top_customer = TopCustomer(**customer_data)
-        assert top_customer.customer_id == 1
-        assert top_customer.name == "John Doe"
-        assert top_customer.total_revenue == Decimal("15000.00")
-
-    def test_kpi_summary_schema(self):
-        """Test KPI summary schema"""
-        kpi_data = {
-            "total_revenue": Decimal("100000.00"),
-            "outstanding_amount": Decimal("25000.00"),
-            "overdue_amount": Decimal("8000.00"),
-            "collection_efficiency": 75.5,
-            "revenue_growth": 12.3,
-            "total_customers": 150,
-            "active_invoices": 45,
-            "overdue_invoices": 8,
-        }
-
-        kpi_summary = KPISummary(**kpi_data)
-        assert kpi_summary.total_revenue == Decimal("100000.00")
-        assert kpi_summary.collection_efficiency == 75.5
-        assert kpi_summary.total_customers == 150
-
-    def test_quick_stats_schema(self):
-        """Test quick stats schema"""
-        stats_data = {
-            "total_revenue_this_month": Decimal("25000.00"),
-            "total_outstanding": Decimal("15000.00"),
-            "overdue_amount": Decimal("5000.00"),
-            "total_customers": 75,
-            "invoices_this_month": 20,
-            "payments_this_month": 15,
-        }
-
-        quick_stats = QuickStats(**stats_data)
-        assert quick_stats.total_revenue_this_month == Decimal("25000.00")
-        assert quick_stats.total_customers == 75
-        assert quick_stats.invoices_this_month == 20
+    @pytest.mark.parametrize("schema,data,checks", _SCHEMA_CASES)
+    def test_schema_round_trip(self, schema, data, checks):
+        """Test that flat dashboard schemas validate and keep their values"""
+        instance = schema(**data)
+        for field, expected in checks.items():
+            assert getattr(instance, field) == expected
 
 
 class TestDashboardBusinessLogic:
@@ -228,8 +244,8 @@ class TestDashboardBusinessLogic:
         current_revenue = Decimal("50000.00")
         previous_revenue = Decimal("40000.00")
 
-        growth_percentage = float(
-            (current_revenue - previous_revenue) / previous_revenue * 100
+        growth_percentage = _percentage(
+            current_revenue - previous_revenue, previous_revenue
         )
 
         assert growth_percentage == 25.0
@@ -240,8 +256,8 @@ class TestDashboardBusinessLogic:
         current_revenue = Decimal("40000.00")
         previous_revenue = Decimal("50000.00")
 
-        growth_percentage = float(
-            (current_revenue - previous_revenue) / previous_revenue * 100
+        growth_percentage = _percentage(
+            current_revenue - previous_revenue, previous_revenue
         )
 
         assert growth_percentage == -20.0
@@ -252,7 +268,7 @@ class TestDashboardBusinessLogic:
         total_outstanding = Decimal("20000.00")
         current_amount = Decimal("15000.00")  # Not yet due
 
-        collection_efficiency = float(current_amount / total_outstanding * 100)
+        collection_efficiency = _percentage(current_amount, total_outstanding)
 
         assert collection_efficiency == 75.0
         assert 0 <= collection_efficiency <= 100
@@ -262,7 +278,7 @@ class TestDashboardBusinessLogic:
         total_outstanding = Decimal("20000.00")
         overdue_amount = Decimal("6000.00")
 
-        overdue_percentage = float(overdue_amount / total_outstanding * 100)
+        overdue_percentage = _percentage(overdue_amount, total_outstanding)
 
         assert overdue_percentage == 30.0
         assert 0 <= overdue_percentage <= 100
@@ -276,7 +292,7 @@ class TestDashboardBusinessLogic:
             {"amount": Decimal("500.00")},
         ]
 
-        total_amount = sum(invoice["amount"] for invoice in invoices)
+        total_amount = sum(map(itemgetter("amount"), invoices), Decimal("0.00"))
         average_value = total_amount / len(invoices)
 
         assert average_value == Decimal("1250.00")
@@ -291,13 +307,11 @@ class TestDashboardBusinessLogic:
             {"status": "inactive"},
         ]
 
+        # Both status counts in one pass
+        status_counts = Counter(c["status"] for c in customers)
         total_customers = len(customers)
-        active_customers = len(
-            [c for c in customers if c["status"] == "active"]
-        )
-        inactive_customers = len(
-            [c for c in customers if c["status"] == "inactive"]
-        )
+        active_customers = status_counts["active"]
+        inactive_customers = status_counts["inactive"]
 
         assert total_customers == 5
         assert active_customers == 3
@@ -313,26 +327,32 @@ class TestDashboardBusinessLogic:
             {"method": "cash", "amount": Decimal("200.00")},
         ]
 
-        method_breakdown = {}
+        # [count, amount] per method, filled in a single pass
+        totals = defaultdict(lambda: [0, Decimal("0.00")])
         for payment in payments:
-            method = payment["method"]
-            amount = payment["amount"]
-
-            if method not in method_breakdown:
-                method_breakdown[method] = {
-                    "count": 0,
-                    "amount": Decimal("0.00"),
-                }
+            entry = totals[payment["method"]]
+            entry[0] += 1
+            entry[1] += payment["amount"]
 
-            method_breakdown[method]["count"] += 1
-            method_breakdown[method]["amount"] += amount
+        method_breakdown = {
+            method: {"count": count, "amount": amount}
+            for method, (count, amount) in totals.items()
+        }
 
         assert method_breakdown["bank_transfer"]["count"] == 2
         assert method_breakdown["bank_transfer"]["amount"] == Decimal("2500.00")
         assert method_breakdown["credit_card"]["count"] == 1
         assert method_breakdown["cash"]["amount"] == Decimal("200.00")
 
-    def test_top_customers_ranking(self):
+    @pytest.mark.parametrize(
+        "limit,expected_names",
+        [
+            (1, ["Customer D"]),
+            (2, ["Customer D", "Customer B"]),
+            (10, ["Customer D", "Customer B", "Customer A", "Customer C"]),
+        ],
+    )
+    def test_top_customers_ranking(self, limit, expected_names):
         """Test top customers ranking logic"""
         customers = [
             {"name": "Customer A", "revenue": Decimal("5000.00")},
@@ -341,15 +361,19 @@ class TestDashboardBusinessLogic:
             {"name": "Customer D", "revenue": Decimal("12000.00")},
         ]
 
-        # Sort by revenue (highest first)
-        top_customers = sorted(
-            customers, key=lambda x: x["revenue"], reverse=True
+        # Highest revenue first, capped at limit (ORDER BY ... DESC LIMIT)
+        top_customers = heapq.nlargest(
+            limit, customers, key=itemgetter("revenue")
         )
 
-        assert top_customers[0]["name"] == "Customer D"
+        assert [c["name"] for c in top_customers] == expected_names
         assert top_customers[0]["revenue"] == Decimal("12000.00")
-        assert top_customers[1]["name"] == "Customer B"
-        assert top_customers[-1]["name"] == "Customer C"
+
+
+@pytest.fixture(scope="module")
+def dashboard_service_attrs():
+    """Attribute names available on DashboardService"""
+    return frozenset(dir(DashboardService))
 
 
 class TestDashboardService:
@@ -357,55 +381,66 @@ class TestDashboardService:
 
     def test_dashboard_service_import(self):
         """Test that dashboard service can be imported"""
-        from app.services.dashboard_service import DashboardService
-
         # Should be able to import and instantiate (with mock db)
         assert DashboardService is not None
 
-    def test_dashboard_service_methods(self):
+    def test_dashboard_service_methods(self, dashboard_service_attrs):
         """Test that dashboard service has required methods"""
-        from app.services.dashboard_service import DashboardService
+        required = {
+            "get_dashboard_overview",
+            "get_revenue_metrics",
+            "get_invoice_metrics",
+            "get_payment_metrics",
+            "get_customer_metrics",
+            "get_aging_metrics",
+            "get_recent_activity",
+            "get_top_customers",
+        }
+
+        # Report every missing method at once
+        assert required - dashboard_service_attrs == set()
 
-        # Check that all required methods exist
-        assert hasattr(DashboardService, "get_dashboard_overview")
-        assert hasattr(DashboardService, "get_revenue_metrics")
-        assert hasattr(DashboardService, "get_invoice_metrics")
-        assert hasattr(DashboardService, "get_payment_metrics")
-        assert hasattr(DashboardService, "get_customer_metrics")
-        assert hasattr(DashboardService, "get_aging_metrics")
-        assert hasattr(DashboardService, "get_recent_activity")
-        assert hasattr(DashboardService, "get_top_customers")
+
+@pytest.fixture(scope="module")
+def reports_router():
+    """The reports router, imported on first use by this module's tests"""
+    from app.api.v1.reports import router
+
+    return router
+
+
+@pytest.fixture(scope="module")
+def dashboard_routes(reports_router):
+    """Paths registered on the reports router"""
+    return frozenset(route.path for route in reports_router.routes)
 
 
 class TestDashboardAPI:
     """Test dashboard API endpoints"""
 
-    def test_dashboard_api_import(self):
+    def test_dashboard_api_import(self, reports_router):
         """Test that dashboard API can be imported"""
-        from app.api.v1.reports import router
+        assert reports_router is not None
 
-        assert router is not None
-
-    def test_dashboard_api_endpoints_exist(self):
+    def test_dashboard_api_endpoints_exist(self, dashboard_routes):
         """Test that dashboard API endpoints are defined"""
-        from app.api.v1.reports import router
-
-        # Check that dashboard routes exist
-        routes = [route.path for route in router.routes]
-        assert "/dashboard" in routes
-        assert "/dashboard/kpis" in routes
-        assert "/dashboard/quick-stats" in routes
-        assert "/dashboard/revenue-metrics" in routes
-        assert "/dashboard/top-customers" in routes
-        assert "/dashboard/recent-activity" in routes
-
-    def test_dashboard_api_methods(self):
-        """Test that dashboard API has correct HTTP methods"""
-        from app.api.v1.reports import router
+        expected = {
+            "/dashboard",
+            "/dashboard/kpis",
+            "/dashboard/quick-stats",
+            "/dashboard/revenue-metrics",
+            "/dashboard/top-customers",
+            "/dashboard/recent-activity",
+        }
+
+        # Report every missing route at once
+        assert expected - dashboard_routes == set()
 
+    def test_dashboard_api_methods(self, reports_router):
+        """Test that dashboard API has correct HTTP methods"""
         # Get all route methods
         all_methods = []
-        for route in router.routes:
+        for route in reports_router.routes:
             if hasattr(route, "methods"):
                 all_methods.extend(route.methods)
 
@@ -414,13 +449,7 @@ class TestDashboardAPI:
 
     def test_dashboard_schemas_integration(self):
         """Test that dashboard schemas work with API"""
-        from app.schemas.dashboard import DashboardOverview, KPISummary
-
         # Test that schemas can be used for API serialization
-        today = date.today()
-        yesterday = today - timedelta(days=1)
-        now = datetime.now()
-
         kpi_data = {
             "total_revenue": Decimal("50000.00"),
             "outstanding_amount": Decimal("15000.00"),
@@ -436,20 +465,14 @@ class TestDashboardAPI:
         kpi_summary = KPISummary(**kpi_data)
         assert kpi_summary.total_revenue == Decimal("50000.00")
 
-    def test_dashboard_service_integration(self):
+    def test_dashboard_service_integration(self, dashboard_service_attrs):
         """Test that dashboard service integrates with API"""
-        from app.services.dashboard_service import DashboardService
-
-        # Should be able to import service used by API
-        assert DashboardService is not None
-
         # Check that service methods match API endpoint functionality
-        service_methods = [
+        service_methods = {
             "get_dashboard_overview",  # Used by /dashboard endpoint
             "get_revenue_metrics",  # Used by /dashboard/revenue-metrics endpoint
             "get_top_customers",  # Used by /dashboard/top-customers endpoint
             "get_recent_activity",  # Used by /dashboard/recent-activity endpoint
-        ]
+        }
 
-        for method in service_methods:
-            assert hasattr(DashboardService, method)
+        assert service_methods - dashboard_service_attrs == set()
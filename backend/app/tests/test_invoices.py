@@ -2,7 +2,6 @@ import pytest
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 
-from app.core.security import create_access_token
 from app.schemas.invoice import (
     InvoiceCreate,
     InvoiceUpdate,
@@ -268,17 +267,6 @@ class TestInvoiceSchemas:
 class TestInvoiceBusinessLogic:
     """Test invoice business logic without database"""
 
-    def create_test_token(
-        self, user_id: int = 1, organization_id: int = 1, role: str = "owner"
-    ):
-        """Helper to create test JWT token"""
-        return create_access_token(
-            user_id=user_id,
-            organization_id=organization_id,
-            email="test@example.com",
-            role=role,
-        )
-
     def test_invoice_number_generation_logic(self):
         """Test invoice number generation logic"""
         # Test basic format
@@ -472,6 +460,7 @@ class TestInvoicePDFService:
         assert "SectionHeader" in service.styles
         assert "Address" in service.styles
         assert "Total" in service.styles
+        assert "Footer" in service.styles
 
     def test_pdf_service_methods_exist(self):
         """Test that PDF service has all required methods"""
@@ -485,6 +474,7 @@ class TestInvoicePDFService:
         assert hasattr(service, "_build_bill_to_section")
         assert hasattr(service, "_build_invoice_details")
         assert hasattr(service, "_build_line_items_table")
+        assert hasattr(service, "_build_line_items_table_from_columns")
         assert hasattr(service, "_build_totals_section")
         assert hasattr(service, "_build_notes_section")
         assert hasattr(service, "_build_footer")
@@ -550,6 +540,150 @@ class TestInvoicePDFService:
         # Check PDF header (should start with %PDF)
         assert pdf_content.startswith(b"%PDF")
 
+    def test_pdf_line_items_from_columns(self):
+        """Test line item columns are formatted with the organization currency"""
+        from types import SimpleNamespace
+
+        from app.services.pdf_service import InvoicePDFService
+
+        service = InvoicePDFService()
+        columns = (
+            ["Web Development", "Consulting"],
+            [Decimal("10"), Decimal("1.5")],
+            [Decimal("1000.00"), Decimal("200.00")],
+            [Decimal("10000.00"), Decimal("300.00")],
+        )
+
+        elements = service._build_line_items_table_from_columns(
+            columns, SimpleNamespace(currency_symbol="₦")
+        )
+
+        assert elements[0]._cellvalues == [
+            ["Description", "Quantity", "Unit Price", "Total"],
+            ["Web Development", "10.00", "₦1,000.00", "₦10,000.00"],
+            ["Consulting", "1.50", "₦200.00", "₦300.00"],
+        ]
+
+    def test_pdf_notes_section(self):
+        """Test notes render safely whatever characters they contain"""
+        from types import SimpleNamespace
+
+        from reportlab.platypus import Paragraph, Preformatted
+
+        from app.services.pdf_service import InvoicePDFService
+
+        service = InvoicePDFService()
+
+        short_notes = service._build_notes_section(
+            SimpleNamespace(notes="Net 30 <terms> & conditions")
+        )
+        assert isinstance(short_notes[1], Preformatted)
+
+        # Short but wider than the page frame, so it has to wrap
+        wide_notes = service._build_notes_section(SimpleNamespace(notes="W" * 79))
+        assert isinstance(wide_notes[1], Paragraph)
+
+        long_notes = service._build_notes_section(
+            SimpleNamespace(notes="Pay <b>promptly</b> & on time\n" * 5)
+        )
+        assert isinstance(long_notes[1], Paragraph)
+        assert "&lt;b&gt;promptly&lt;/b&gt; &amp; on time<br/>" in long_notes[1].text
+
+    def test_pdf_snapshots_are_slotted(self):
+        """Test PDF snapshots are frozen, slotted dataclasses"""
+        import dataclasses
+
+        from app.services.pdf_service import (
+            InvoiceItemSnapshot,
+            InvoicePDFSnapshot,
+            OrganizationPDFSnapshot,
+        )
+
+        organization = OrganizationPDFSnapshot(name="Test Company")
+        for snapshot in (InvoiceItemSnapshot, InvoicePDFSnapshot, OrganizationPDFSnapshot):
+            assert hasattr(snapshot, "__slots__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            organization.name = "Renamed Co"
+
+    def test_pdf_date_format(self):
+        """Test invoice dates match the strftime('%B %d, %Y') format"""
+        from datetime import date
+
+        from app.services.pdf_service import _format_date
+
+        for value in (date(2024, 3, 5), date(2024, 12, 31), date(2025, 1, 1)):
+            assert _format_date(value) == value.strftime("%B %d, %Y")
+
+    def test_pdf_org_template_cached(self):
+        """Test header and footer text is cached per organization across services"""
+        from app.services.pdf_service import InvoicePDFService, _org_template
+
+        _org_template.cache_clear()
+        template = _org_template("Test Company", "test@company.com")
+        assert _org_template("Test Company", "test@company.com") is template
+        assert _org_template.cache_info().hits == 1
+        assert template.footer_text == "Thank you for your business! | Test Company | test@company.com"
+
+        # A renamed organization gets a fresh template
+        assert _org_template("Renamed Co", "test@company.com") is not template
+
+        # Each render builds its own flowables from the shared template
+        first, second = InvoicePDFService(), InvoicePDFService()
+        first_footer = first._build_footer(template)
+        second_footer = second._build_footer(template)
+        assert first_footer[-1] is not second_footer[-1]
+        assert first_footer[-1].text == second_footer[-1].text == template.footer_text
+
+    @pytest.mark.asyncio
+    async def test_pdf_generation_async(self):
+        """Test PDF generation offloaded to the process pool"""
+        from datetime import date
+        from decimal import Decimal
+        from types import SimpleNamespace
+
+        from app.services.pdf_service import (
+            InvoicePDFService,
+            InvoicePDFSnapshot,
+            OrganizationPDFSnapshot,
+        )
+
+        invoice = SimpleNamespace(
+            invoice_number="INV-2024-0002",
+            invoice_date=date.today(),
+            due_date=date.today(),
+            status="sent",
+            subtotal=Decimal("500.00"),
+            tax_amount=Decimal("0.00"),
+            total_amount=Decimal("500.00"),
+            paid_amount=Decimal("0.00"),
+            notes=None,
+            items=[
+                SimpleNamespace(
+                    description="Design",
+                    quantity=Decimal("5"),
+                    unit_price=Decimal("100.00"),
+                    line_total=Decimal("500.00"),
+                )
+            ],
+        )
+        organization = SimpleNamespace(
+            name="Test Company", email="test@company.com", currency_symbol=None
+        )
+
+        invoice_snapshot = InvoicePDFSnapshot.from_invoice(invoice)
+        assert invoice_snapshot.items[0].description == "Design"
+        assert not hasattr(invoice_snapshot, "__dict__")
+
+        service = InvoicePDFService()
+        pdf_content = await service.generate_invoice_pdf_async(
+            invoice=invoice_snapshot,
+            organization=OrganizationPDFSnapshot.from_organization(organization),
+            customer_data={"name": "Test Customer"},
+        )
+
+        assert isinstance(pdf_content, bytes)
+        assert pdf_content.startswith(b"%PDF")
+
     def test_pdf_api_endpoint_structure(self):
         """Test that PDF API endpoint is properly defined"""
         from app.api.v1.invoices import router
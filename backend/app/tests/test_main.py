@@ -3,8 +3,8 @@ from httpx import AsyncClient
 
 
 @pytest.mark.asyncio
-async def test_root_endpoint(client: AsyncClient):
-    response = await client.get("/")
+async def test_root_endpoint(api_client: AsyncClient):
+    response = await api_client.get("/")
     assert response.status_code == 200
     data = response.json()
     assert data["message"] == "Arvalox API"
@@ -12,8 +12,8 @@ async def test_root_endpoint(client: AsyncClient):
 
 
 @pytest.mark.asyncio
-async def test_health_check(client: AsyncClient):
-    response = await client.get("/health")
+async def test_health_check(api_client: AsyncClient):
+    response = await api_client.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
@@ -2,7 +2,6 @@ import pytest
 from datetime import date, datetime, timedelta
 from decimal import Decimal
 
-from app.core.security import create_access_token
 from app.schemas.payment import (
     PaymentCreate,
     PaymentUpdate,
@@ -299,17 +298,6 @@ class TestPaymentSchemas:
 class TestPaymentBusinessLogic:
     """Test payment business logic without database"""
 
-    def create_test_token(
-        self, user_id: int = 1, organization_id: int = 1, role: str = "owner"
-    ):
-        """Helper to create test JWT token"""
-        return create_access_token(
-            user_id=user_id,
-            organization_id=organization_id,
-            email="test@example.com",
-            role=role,
-        )
-
     def test_payment_status_transitions(self):
         """Test valid payment status transitions"""
         valid_transitions = {
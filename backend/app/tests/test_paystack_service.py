@@ -0,0 +1,81 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import paystack_service
+from app.services.paystack_service import PaystackService
+
+
+class TestPaystackVerificationCache:
+    """Test caching of Paystack transaction verifications"""
+
+    @pytest.fixture(autouse=True)
+    def clear_verified_transactions(self):
+        """Start every test with an empty verification cache"""
+        paystack_service._VERIFIED_TRANSACTIONS.clear()
+        yield
+        paystack_service._VERIFIED_TRANSACTIONS.clear()
+
+    @staticmethod
+    def mock_paystack_response(data):
+        """Mock aiohttp returning a verification response"""
+        response = MagicMock()
+
+        async def json():
+            return {"status": True, "data": data}
+
+        response.json = json
+        request = MagicMock()
+        request.__aenter__.return_value = response
+        session = MagicMock()
+        session.__aenter__.return_value = session
+        session.get.return_value = request
+        return session
+
+    @pytest.mark.asyncio
+    async def test_successful_verification_is_cached(self):
+        """Test a successful verification is only fetched once"""
+        session = self.mock_paystack_response({"status": "success", "reference": "ref_1"})
+
+        with patch("app.services.paystack_service.aiohttp.ClientSession", return_value=session):
+            service = PaystackService()
+            first = await service.verify_transaction("ref_1")
+            second = await service.verify_transaction("ref_1")
+
+        assert first == second == {"status": "success", "reference": "ref_1"}
+        session.get.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_pending_verification_is_not_cached(self):
+        """Test pending transactions are verified again on every call"""
+        session = self.mock_paystack_response({"status": "pending", "reference": "ref_2"})
+
+        with patch("app.services.paystack_service.aiohttp.ClientSession", return_value=session):
+            service = PaystackService()
+            await service.verify_transaction("ref_2")
+            await service.verify_transaction("ref_2")
+
+        assert session.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_forgotten_verification_is_fetched_again(self):
+        """Test evicting a reference makes the next verification call Paystack"""
+        session = self.mock_paystack_response({"status": "success", "reference": "ref_3"})
+
+        with patch("app.services.paystack_service.aiohttp.ClientSession", return_value=session):
+            service = PaystackService()
+            await service.verify_transaction("ref_3")
+            PaystackService.forget_verified_transaction("ref_3")
+            await service.verify_transaction("ref_3")
+
+        assert session.get.call_count == 2
+
+    def test_cache_is_bounded(self):
+        """Test the verification cache never grows past its limit"""
+        for i in range(paystack_service._VERIFIED_TRANSACTIONS_MAX + 10):
+            paystack_service._remember_verified_transaction(
+                f"ref_{i}", {"status": "success", "reference": f"ref_{i}"}
+            )
+
+        assert len(paystack_service._VERIFIED_TRANSACTIONS) == paystack_service._VERIFIED_TRANSACTIONS_MAX
+        assert "ref_0" not in paystack_service._VERIFIED_TRANSACTIONS
@@ -287,7 +287,7 @@ class TestSubscriptionModels:
         # Extend trial for new subscription
         subscription.extend_trial(14)
         assert subscription.trial_start is not None
-        assert subscription.trial_end is not None
+        assert subscription.trial_end - subscription.trial_start == timedelta(days=14)
         assert subscription.status == SubscriptionStatus.TRIALING
         
         # Extend existing trial
@@ -295,6 +295,37 @@ class TestSubscriptionModels:
         subscription.extend_trial(7)
         assert subscription.trial_end > original_trial_end
 
+    def test_subscription_increment_usage_counts(self):
+        """Test usage counters apply a whole delta at once"""
+        now = datetime.now(timezone.utc)
+        
+        subscription = Subscription(
+            organization_id=1,
+            plan_id=1,
+            status=SubscriptionStatus.ACTIVE,
+            billing_interval=BillingInterval.MONTHLY,
+            started_at=now,
+            current_period_start=now,
+            current_period_end=now + timedelta(days=30),
+            current_invoice_count=0,
+            current_customer_count=0,
+            current_team_member_count=1,
+        )
+        
+        subscription.increment_invoice_count(by=1000)
+        subscription.increment_customer_count(by=25)
+        subscription.increment_team_member_count()
+        
+        assert subscription.current_invoice_count == 1000
+        assert subscription.current_customer_count == 25
+        assert subscription.current_team_member_count == 2
+
+    def test_subscription_plan_relationships_load_selectin(self):
+        """Test plan relationships are batched with selectin loading by default"""
+        assert Subscription.plan.property.lazy == "selectin"
+        assert Subscription.downgrade_plan.property.lazy == "selectin"
+        assert Subscription.organization.property.lazy == "select"
+
     def test_usage_record_creation(self):
         """Test UsageRecord model creation"""
         usage_record = UsageRecord(
@@ -6,7 +6,6 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 
-from app.main import app
 from app.core.dependencies import get_current_user
 from app.models.subscription import (
     SubscriptionPlan,
@@ -23,14 +22,12 @@ class TestSubscriptionAPI:
     """Test subscription API endpoints"""
 
     @pytest.fixture(autouse=True)
-    def setup_auth(self, mock_current_user):
+    def setup_auth(self, test_app, mock_current_user):
         """Set up authentication override for all tests"""
         def get_mock_user():
             return mock_current_user
         
-        app.dependency_overrides[get_current_user] = get_mock_user
-        yield
-        app.dependency_overrides.clear()
+        test_app.dependency_overrides[get_current_user] = get_mock_user
 
     @pytest.fixture
     def mock_current_user(self):
@@ -93,7 +90,7 @@ class TestSubscriptionAPI:
         subscription.plan = mock_subscription_plan
         return subscription
 
-    def test_get_subscription_plans(self):
+    def test_get_subscription_plans(self, test_app):
         """Test getting all subscription plans"""
         mock_plans = [
             SubscriptionPlan(
@@ -135,7 +132,7 @@ class TestSubscriptionAPI:
         with patch("app.services.subscription_service.SubscriptionService.get_all_plans") as mock_get_plans:
             mock_get_plans.return_value = mock_plans
 
-            with TestClient(app) as client:
+            with TestClient(test_app) as client:
                 response = client.get("/api/v1/subscriptions/plans")
 
             assert response.status_code == 200
@@ -146,7 +143,7 @@ class TestSubscriptionAPI:
             assert data[1]["name"] == "Professional Plan"
             assert data[1]["monthly_price"] == "15000.00"
 
-    def test_get_subscription_plan_by_id(self, mock_subscription_plan):
+    def test_get_subscription_plan_by_id(self, test_app, mock_subscription_plan):
         """Test getting a specific subscription plan"""
         with patch("app.core.dependencies.get_db") as mock_get_db:
             mock_db = AsyncMock()
@@ -155,7 +152,7 @@ class TestSubscriptionAPI:
             mock_db.execute.return_value = mock_result
             mock_get_db.return_value = mock_db
 
-            with TestClient(app) as client:
+            with TestClient(test_app) as client:
                 response = client.get("/api/v1/subscriptions/plans/2")
 
             assert response.status_code == 200
@@ -186,17 +183,17 @@ class TestSubscriptionAPI:
         assert data["usage_stats"]["can_create_invoice"] is True
 
     @pytest.mark.asyncio
-    async def test_get_current_subscription_not_found(self, mock_current_user, client: AsyncClient):
+    async def test_get_current_subscription_not_found(self, mock_current_user, api_client: AsyncClient):
         """Test getting current subscription when none exists"""
         with patch("app.services.subscription_service.SubscriptionService.get_organization_subscription") as mock_get_subscription:
             mock_get_subscription.return_value = None
-            response = await client.get("/api/v1/subscriptions/current")
+            response = await api_client.get("/api/v1/subscriptions/current")
 
         assert response.status_code == 404
         assert "No subscription found" in response.json()["detail"]
 
     @pytest.mark.asyncio
-    async def test_create_subscription(self, mock_current_user, mock_subscription_plan, client: AsyncClient):
+    async def test_create_subscription(self, test_app, mock_current_user, mock_subscription_plan, api_client: AsyncClient):
         """Test creating a new subscription"""
         request_data = {
             "plan_id": 2,
@@ -233,7 +230,7 @@ class TestSubscriptionAPI:
         
         # Override get_db to return our mocked database session
         from app.core.database import get_db
-        app.dependency_overrides[get_db] = mock_db_session
+        test_app.dependency_overrides[get_db] = mock_db_session
 
         with patch("app.services.subscription_service.SubscriptionService.get_organization_subscription") as mock_get_existing, \
              patch("app.services.subscription_service.SubscriptionService.create_subscription") as mock_create:
@@ -241,7 +238,7 @@ class TestSubscriptionAPI:
             mock_get_existing.return_value = None  # No existing subscription
             mock_create.return_value = mock_subscription
 
-            response = await client.post("/api/v1/subscriptions/create", json=request_data)
+            response = await api_client.post("/api/v1/subscriptions/create", json=request_data)
 
             assert response.status_code == 200
             data = response.json()
@@ -249,7 +246,7 @@ class TestSubscriptionAPI:
             assert data["plan_id"] == 2
             assert data["status"] == "trialing"
 
-    def test_create_subscription_already_exists(self, mock_current_user, mock_subscription):
+    def test_create_subscription_already_exists(self, test_app, mock_current_user, mock_subscription):
         """Test creating subscription when one already exists"""
         request_data = {
             "plan_id": 1,
@@ -262,14 +259,14 @@ class TestSubscriptionAPI:
             mock_get_user.return_value = mock_current_user
             mock_get_existing.return_value = mock_subscription
 
-            with TestClient(app) as client:
+            with TestClient(test_app) as client:
                 response = client.post("/api/v1/subscriptions/create", json=request_data)
 
             assert response.status_code == 400
             assert "already has an active subscription" in response.json()["detail"]
 
     @pytest.mark.asyncio
-    async def test_create_subscription_permission_denied(self, client: AsyncClient):
+    async def test_create_subscription_permission_denied(self, test_app, api_client: AsyncClient):
         """Test creating subscription without proper permissions"""
         # Override the mock user for this specific test
         mock_user = User(
@@ -281,20 +278,20 @@ class TestSubscriptionAPI:
         def get_mock_sales_rep_user():
             return mock_user
         
-        app.dependency_overrides[get_current_user] = get_mock_sales_rep_user
+        test_app.dependency_overrides[get_current_user] = get_mock_sales_rep_user
         
         request_data = {
             "plan_id": 1,
             "billing_interval": "monthly"
         }
 
-        response = await client.post("/api/v1/subscriptions/create", json=request_data)
+        response = await api_client.post("/api/v1/subscriptions/create", json=request_data)
 
         assert response.status_code == 403
         assert "Only organization owners and admins" in response.json()["detail"]
 
     @pytest.mark.asyncio
-    async def test_upgrade_subscription(self, mock_current_user, mock_subscription, mock_subscription_plan, client: AsyncClient):
+    async def test_upgrade_subscription(self, test_app, mock_current_user, mock_subscription, mock_subscription_plan, api_client: AsyncClient):
         """Test upgrading subscription"""
         request_data = {
             "plan_id": 2,
@@ -353,7 +350,7 @@ class TestSubscriptionAPI:
         
         # Override get_db to return our mocked database session
         from app.core.database import get_db
-        app.dependency_overrides[get_db] = mock_db_session
+        test_app.dependency_overrides[get_db] = mock_db_session
 
         with patch("app.services.subscription_service.SubscriptionService.get_organization_subscription") as mock_get_subscription, \
              patch("app.services.subscription_service.SubscriptionService.update_subscription_with_usage_reset") as mock_update:
@@ -361,7 +358,7 @@ class TestSubscriptionAPI:
             mock_get_subscription.return_value = mock_subscription
             mock_update.return_value = updated_subscription
 
-            response = await client.put("/api/v1/subscriptions/upgrade", json=request_data)
+            response = await api_client.put("/api/v1/subscriptions/upgrade", json=request_data)
 
             assert response.status_code == 200
             data = response.json()
@@ -369,7 +366,7 @@ class TestSubscriptionAPI:
             assert data["billing_interval"] == "yearly"
 
     @pytest.mark.asyncio
-    async def test_cancel_subscription(self, mock_current_user, mock_subscription, client: AsyncClient):
+    async def test_cancel_subscription(self, test_app, mock_current_user, mock_subscription, api_client: AsyncClient):
         """Test canceling subscription"""
         request_data = {
             "cancel_immediately": False,
@@ -405,7 +402,7 @@ class TestSubscriptionAPI:
         
         # Override get_db to return our mocked database session
         from app.core.database import get_db
-        app.dependency_overrides[get_db] = mock_db_session
+        test_app.dependency_overrides[get_db] = mock_db_session
 
         with patch("app.services.subscription_service.SubscriptionService.get_organization_subscription") as mock_get_subscription, \
              patch("app.services.subscription_service.SubscriptionService.cancel_subscription") as mock_cancel:
@@ -413,7 +410,7 @@ class TestSubscriptionAPI:
             mock_get_subscription.return_value = mock_subscription
             mock_cancel.return_value = canceled_subscription
 
-            response = await client.post("/api/v1/subscriptions/cancel", json=request_data)
+            response = await api_client.post("/api/v1/subscriptions/cancel", json=request_data)
 
             assert response.status_code == 200
             data = response.json()
@@ -421,13 +418,13 @@ class TestSubscriptionAPI:
             assert data["canceled_at"] is not None
 
     @pytest.mark.asyncio
-    async def test_get_usage_stats(self, mock_current_user, mock_subscription, client: AsyncClient):
+    async def test_get_usage_stats(self, mock_current_user, mock_subscription, api_client: AsyncClient):
         """Test getting usage statistics"""
         with patch("app.services.subscription_service.SubscriptionService.get_organization_subscription") as mock_get_subscription:
 
             mock_get_subscription.return_value = mock_subscription
 
-            response = await client.get("/api/v1/subscriptions/usage")
+            response = await api_client.get("/api/v1/subscriptions/usage")
 
             assert response.status_code == 200
             data = response.json()
@@ -437,7 +434,7 @@ class TestSubscriptionAPI:
             assert data["can_create_invoice"] is True
 
     @pytest.mark.asyncio
-    async def test_compare_plans(self, mock_current_user, mock_subscription, client: AsyncClient):
+    async def test_compare_plans(self, mock_current_user, mock_subscription, api_client: AsyncClient):
         """Test comparing subscription plans"""
         now = datetime.now(timezone.utc)
         all_plans = [
@@ -509,7 +506,7 @@ class TestSubscriptionAPI:
             mock_get_subscription.return_value = mock_subscription
             mock_get_plans.return_value = all_plans
 
-            response = await client.get("/api/v1/subscriptions/compare")
+            response = await api_client.get("/api/v1/subscriptions/compare")
 
             assert response.status_code == 200
             data = response.json()
@@ -1,8 +1,14 @@
 import pytest
+import re
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import selectinload
+
+from app.models.organization import Organization
 from app.services.subscription_service import SubscriptionService
 from app.models.subscription import (
     SubscriptionPlan,
@@ -14,6 +20,38 @@ from app.models.subscription import (
 )
 
 
+def compile_executed(mock_db):
+    """Compile the last statement passed to the mocked session"""
+    statement = mock_db.execute.call_args.args[0]
+    return statement.compile(dialect=postgresql.dialect())
+
+
+def executed_sql(mock_db):
+    """Render the last executed statement with its parameters inlined"""
+    statement = mock_db.execute.call_args.args[0]
+    return str(statement.compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    ))
+
+
+def raises_on_lazy_load(mock_db):
+    """Check the last executed statement blocks lazy loads with raiseload('*')"""
+    statement = mock_db.execute.call_args.args[0]
+    return any(
+        getattr(option, "strategy", None) == (("lazy", "raise"),)
+        for option in statement._with_options
+    )
+
+
+def returning_inserted_row(mock_db):
+    """Make the mocked session hand back the row an INSERT ... RETURNING would"""
+    def scalar(statement):
+        values = statement.compile(dialect=postgresql.dialect()).params
+        return Subscription(**values)
+
+    mock_db.scalar.side_effect = scalar
+
+
 class TestSubscriptionService:
     """Test SubscriptionService functionality"""
 
@@ -23,6 +61,9 @@ class TestSubscriptionService:
         db_mock = AsyncMock()
         # Make synchronous methods use MagicMock to avoid coroutine warnings
         db_mock.add = MagicMock()
+        db_mock.info = {}
+        # Merging a cached plan hands back the same instance
+        db_mock.merge.side_effect = lambda instance, load=True: instance
         return db_mock
 
     @pytest.mark.asyncio
@@ -30,11 +71,25 @@ class TestSubscriptionService:
         """Test creating default subscription plans"""
         # Mock no existing plans
         mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
+        mock_result.first.return_value = None
         mock_db.execute.return_value = mock_result
+        # Echo the inserted rows back as RETURNING would
+        mock_db.scalars.side_effect = lambda statement, rows: MagicMock(
+            all=lambda: [SubscriptionPlan(**row) for row in rows]
+        )
 
         plans = await SubscriptionService.create_default_plans(mock_db)
         
+        # One multi-row INSERT ... RETURNING, no per-plan add or refresh
+        mock_db.scalars.assert_called_once()
+        statement = mock_db.scalars.call_args.args[0]
+        assert str(statement.compile(dialect=postgresql.dialect())).startswith(
+            "INSERT INTO subscription_plans"
+        )
+        mock_db.add.assert_not_called()
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+        
         assert len(plans) == 3
         assert plans[0].plan_type == PlanType.FREE
         assert plans[1].plan_type == PlanType.PROFESSIONAL
@@ -51,12 +106,30 @@ class TestSubscriptionService:
         assert plans[1].custom_branding is True   # Professional plan
         assert plans[2].max_invoices_per_month is None  # Enterprise unlimited
 
+    @pytest.mark.asyncio
+    async def test_create_default_plans_existing(self, mock_db):
+        """Test default plans are not recreated when plans exist"""
+        existing_plans = [
+            SubscriptionPlan(id=1, name="Free Plan", plan_type=PlanType.FREE, is_active=True, sort_order=1),
+        ]
+
+        mock_result = MagicMock()
+        mock_result.first.return_value = (1,)
+        mock_result.scalars.return_value.all.return_value = existing_plans
+        mock_db.execute.return_value = mock_result
+
+        plans = await SubscriptionService.create_default_plans(mock_db)
+
+        assert [plan.name for plan in plans] == ["Free Plan"]
+        mock_db.scalars.assert_not_called()
+        mock_db.commit.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_get_all_plans(self, mock_db):
         """Test getting all active plans"""
         mock_plans = [
-            SubscriptionPlan(name="Free", plan_type=PlanType.FREE, is_active=True, sort_order=1),
-            SubscriptionPlan(name="Professional Plan", plan_type=PlanType.PROFESSIONAL, is_active=True, sort_order=2),
+            SubscriptionPlan(id=1, name="Free", plan_type=PlanType.FREE, is_active=True, sort_order=1),
+            SubscriptionPlan(id=2, name="Professional Plan", plan_type=PlanType.PROFESSIONAL, is_active=True, sort_order=2),
         ]
         
         mock_result = MagicMock()
@@ -69,13 +142,39 @@ class TestSubscriptionService:
         assert plans[0].name == "Free"
         assert plans[1].name == "Professional Plan"
 
+    @pytest.mark.asyncio
+    async def test_get_all_plans_cached(self, mock_db):
+        """Test repeated plan lookups are served from the cache"""
+        mock_plans = [
+            SubscriptionPlan(id=1, name="Free", plan_type=PlanType.FREE, is_active=True, sort_order=1),
+            SubscriptionPlan(id=2, name="Professional Plan", plan_type=PlanType.PROFESSIONAL, is_active=True, sort_order=2),
+        ]
+        
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = mock_plans
+        mock_db.execute.return_value = mock_result
+
+        await SubscriptionService.get_all_plans(mock_db)
+        plans = await SubscriptionService.get_all_plans(mock_db)
+        plan = await SubscriptionService.get_plan_by_type(mock_db, PlanType.PROFESSIONAL)
+        
+        mock_db.execute.assert_called_once()
+        assert [p.name for p in plans] == ["Free", "Professional Plan"]
+        assert plan.name == "Professional Plan"
+        # Cached copies are detached from the session that loaded them
+        assert plans[0] is not mock_plans[0]
+
+        SubscriptionService.invalidate_plan_cache()
+        await SubscriptionService.get_all_plans(mock_db)
+        assert mock_db.execute.call_count == 2
+
     @pytest.mark.asyncio
     async def test_get_plan_by_type(self, mock_db):
         """Test getting plan by type"""
-        mock_plan = SubscriptionPlan(name="Professional Plan", plan_type=PlanType.PROFESSIONAL)
+        mock_plan = SubscriptionPlan(id=2, name="Professional Plan", plan_type=PlanType.PROFESSIONAL)
         
         mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = mock_plan
+        mock_result.scalars.return_value.all.return_value = [mock_plan]
         mock_db.execute.return_value = mock_result
 
         plan = await SubscriptionService.get_plan_by_type(mock_db, PlanType.PROFESSIONAL)
@@ -84,9 +183,52 @@ class TestSubscriptionService:
         assert plan.name == "Professional Plan"
         assert plan.plan_type == PlanType.PROFESSIONAL
 
+    @pytest.mark.asyncio
+    async def test_get_plan_by_type_not_cached(self, mock_db):
+        """Test inactive plans fall back to a database lookup"""
+        mock_plan = SubscriptionPlan(id=3, name="Enterprise Plan", plan_type=PlanType.ENTERPRISE, is_active=False)
+        
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_result.scalar_one_or_none.return_value = mock_plan
+        mock_db.execute.return_value = mock_result
+
+        plan = await SubscriptionService.get_plan_by_type(mock_db, PlanType.ENTERPRISE)
+        
+        assert plan is mock_plan
+        assert mock_db.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_get_plan_by_id(self, mock_db):
+        """Test getting plan by ID from the plan cache"""
+        mock_plan = SubscriptionPlan(id=2, name="Professional Plan", plan_type=PlanType.PROFESSIONAL)
+        
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [mock_plan]
+        mock_db.execute.return_value = mock_result
+
+        plan = await SubscriptionService.get_plan_by_id(mock_db, 2)
+        
+        assert plan.name == "Professional Plan"
+        mock_db.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_plan_by_id_not_cached(self, mock_db):
+        """Test unknown or inactive plan IDs fall back to the session"""
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
+        mock_db.get.return_value = None
+
+        plan = await SubscriptionService.get_plan_by_id(mock_db, 99)
+        
+        assert plan is None
+        mock_db.get.assert_called_once_with(SubscriptionPlan, 99)
+
     @pytest.mark.asyncio
     async def test_create_subscription_with_trial(self, mock_db):
         """Test creating subscription with trial"""
+        returning_inserted_row(mock_db)
         subscription = await SubscriptionService.create_subscription(
             db=mock_db,
             organization_id=1,
@@ -96,10 +238,12 @@ class TestSubscriptionService:
             trial_days=14,
         )
 
-        # Verify subscription was added to database
-        mock_db.add.assert_called_once()
+        # Verify subscription was inserted with RETURNING, no refresh needed
+        sql = str(mock_db.scalar.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("INSERT INTO subscriptions")
+        assert "RETURNING" in sql
         mock_db.commit.assert_called_once()
-        mock_db.refresh.assert_called_once()
+        mock_db.refresh.assert_not_called()
 
         # Verify subscription properties
         assert subscription.organization_id == 1
@@ -107,10 +251,13 @@ class TestSubscriptionService:
         assert subscription.status == SubscriptionStatus.TRIALING
         assert subscription.billing_interval == BillingInterval.MONTHLY
         assert subscription.current_team_member_count == 1  # Owner
+        assert subscription.current_period_end - subscription.current_period_start == timedelta(days=30)
+        assert subscription.trial_end - subscription.trial_start == timedelta(days=14)
 
     @pytest.mark.asyncio
     async def test_create_subscription_without_trial(self, mock_db):
         """Test creating subscription without trial"""
+        returning_inserted_row(mock_db)
         subscription = await SubscriptionService.create_subscription(
             db=mock_db,
             organization_id=1,
@@ -139,6 +286,31 @@ class TestSubscriptionService:
         
         assert subscription is not None
         assert subscription.organization_id == 1
+        assert raises_on_lazy_load(mock_db)
+
+    @pytest.mark.asyncio
+    async def test_get_organization_subscription_memoized_per_session(self, mock_db):
+        """Test repeat lookups in one session reuse the first result until a write"""
+        mock_subscription = Subscription(
+            organization_id=1,
+            plan_id=1,
+            status=SubscriptionStatus.ACTIVE,
+        )
+        
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = mock_subscription
+        mock_db.execute.return_value = mock_result
+
+        first = await SubscriptionService.get_organization_subscription(mock_db, 1)
+        second = await SubscriptionService.get_organization_subscription(mock_db, 1)
+        
+        assert first is second
+        assert mock_db.execute.call_count == 1
+        
+        SubscriptionService.forget_cached_subscriptions(mock_db)
+        await SubscriptionService.get_organization_subscription(mock_db, 1)
+        
+        assert mock_db.execute.call_count == 2
 
     @pytest.mark.asyncio
     async def test_upgrade_subscription(self, mock_db):
@@ -146,13 +318,13 @@ class TestSubscriptionService:
         mock_subscription = Subscription(
             id=1,
             organization_id=1,
-            plan_id=1,
-            status=SubscriptionStatus.TRIALING,
-            billing_interval=BillingInterval.MONTHLY,
+            plan_id=2,
+            status=SubscriptionStatus.ACTIVE,
+            billing_interval=BillingInterval.YEARLY,
         )
         
         mock_result = MagicMock()
-        mock_result.scalar_one.return_value = mock_subscription
+        mock_result.scalar_one_or_none.return_value = mock_subscription
         mock_db.execute.return_value = mock_result
 
         updated_subscription = await SubscriptionService.upgrade_subscription(
@@ -162,92 +334,221 @@ class TestSubscriptionService:
             billing_interval=BillingInterval.YEARLY,
         )
 
-        assert updated_subscription.plan_id == 2
-        assert updated_subscription.billing_interval == BillingInterval.YEARLY
-        assert updated_subscription.status == SubscriptionStatus.ACTIVE  # Upgraded from trial
+        # Single UPDATE ... RETURNING, no refresh round trip
+        mock_db.execute.assert_called_once()
+        mock_db.refresh.assert_not_called()
+        compiled = compile_executed(mock_db)
+        assert str(compiled).startswith("UPDATE subscriptions")
+        assert "RETURNING" in str(compiled)
+        assert compiled.params["plan_id"] == 2
+        assert compiled.params["billing_interval"] == BillingInterval.YEARLY
+        # Trial is promoted to active in SQL
+        assert (
+            "status=CASE WHEN (subscriptions.status = 'TRIALING') THEN 'ACTIVE' "
+            "ELSE subscriptions.status END"
+        ) in executed_sql(mock_db)
+
+        assert updated_subscription is mock_subscription
 
     @pytest.mark.asyncio
     async def test_cancel_subscription_immediate(self, mock_db):
         """Test immediate subscription cancellation"""
-        mock_subscription = Subscription(
-            id=1,
-            status=SubscriptionStatus.ACTIVE,
-        )
-        
         mock_result = MagicMock()
-        mock_result.scalar_one.return_value = mock_subscription
+        mock_result.scalar_one_or_none.return_value = Subscription(id=1)
         mock_db.execute.return_value = mock_result
 
-        canceled_subscription = await SubscriptionService.cancel_subscription(
+        await SubscriptionService.cancel_subscription(
             db=mock_db,
             subscription_id=1,
             cancel_immediately=True,
         )
 
-        assert canceled_subscription.status == SubscriptionStatus.CANCELED
-        assert canceled_subscription.canceled_at is not None
-        assert canceled_subscription.ended_at is not None
+        mock_db.commit.assert_called_once()
+        compiled = compile_executed(mock_db)
+        assert compiled.params["status"] == SubscriptionStatus.CANCELED
+        assert compiled.params["canceled_at"] is not None
+        assert compiled.params["ended_at"] == compiled.params["canceled_at"]
 
     @pytest.mark.asyncio
     async def test_cancel_subscription_end_of_period(self, mock_db):
         """Test subscription cancellation at end of period"""
-        mock_subscription = Subscription(
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = Subscription(id=1)
+        mock_db.execute.return_value = mock_result
+
+        await SubscriptionService.cancel_subscription(
+            db=mock_db,
+            subscription_id=1,
+            cancel_immediately=False,
+        )
+
+        compiled = compile_executed(mock_db)
+        assert compiled.params["status"] == SubscriptionStatus.CANCELED
+        assert compiled.params["canceled_at"] is not None
+        assert compiled.params["ended_at"] is None  # Runs until period end
+
+    @pytest.mark.asyncio
+    async def test_schedule_downgrade(self, mock_db):
+        """Test scheduling a downgrade with a single UPDATE"""
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [
+            SubscriptionPlan(id=1, name="Free Plan", plan_type=PlanType.FREE),
+        ]
+        mock_result.scalar_one_or_none.return_value = Subscription(id=1, downgrade_to_plan_id=1)
+        mock_db.execute.return_value = mock_result
+
+        await SubscriptionService.schedule_downgrade(mock_db, 1, 1)
+
+        # Plan cache load plus the UPDATE, no subscription SELECT or refresh
+        assert mock_db.execute.call_count == 2
+        sql = str(compile_executed(mock_db))
+        assert sql.startswith("UPDATE subscriptions SET downgrade_to_plan_id=")
+        assert "downgrade_effective_date=subscriptions.current_period_end" in sql
+        assert "RETURNING" in sql
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_schedule_downgrade_unknown_plan(self, mock_db):
+        """Test scheduling a downgrade to a missing plan fails before updating"""
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
+        mock_db.get.return_value = None
+
+        with pytest.raises(ValueError):
+            await SubscriptionService.schedule_downgrade(mock_db, 1, 99)
+
+        mock_db.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_cancel_scheduled_downgrade(self, mock_db):
+        """Test cancelling a scheduled downgrade with a single UPDATE"""
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = Subscription(id=1)
+        mock_db.execute.return_value = mock_result
+
+        await SubscriptionService.cancel_scheduled_downgrade(mock_db, 1)
+
+        mock_db.execute.assert_called_once()
+        compiled = compile_executed(mock_db)
+        assert str(compiled).startswith("UPDATE subscriptions SET downgrade_to_plan_id=")
+        assert "RETURNING" in str(compiled)
+        assert compiled.params["downgrade_to_plan_id"] is None
+        assert compiled.params["downgrade_effective_date"] is None
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_process_scheduled_downgrades(self, mock_db):
+        """Test due downgrades are applied in one bulk UPDATE"""
+        downgraded = [
+            Subscription(id=1, organization_id=1, plan_id=1),
+            Subscription(id=2, organization_id=2, plan_id=1),
+        ]
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = downgraded
+        mock_db.execute.return_value = mock_result
+
+        processed = await SubscriptionService.process_scheduled_downgrades(mock_db)
+
+        mock_db.execute.assert_called_once()
+        compiled = compile_executed(mock_db)
+        sql = str(compiled)
+        assert sql.startswith("UPDATE subscriptions SET plan_id=subscriptions.downgrade_to_plan_id")
+        assert "subscriptions.downgrade_effective_date <= " in sql
+        assert "RETURNING" in sql
+        assert raises_on_lazy_load(mock_db)
+        assert processed == downgraded
+        mock_db.commit.assert_called_once()
+        mock_db.refresh.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_process_scheduled_downgrades_none_due(self, mock_db):
+        """Test nothing is committed when no downgrades are due"""
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = mock_result
+
+        processed = await SubscriptionService.process_scheduled_downgrades(mock_db)
+
+        assert processed == []
+        mock_db.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_subscription_with_usage_reset_upgrade(self, mock_db):
+        """Test upgrading applies immediately with the target plan from the cache"""
+        free_plan = SubscriptionPlan(id=1, name="Free Plan", plan_type=PlanType.FREE)
+        professional_plan = SubscriptionPlan(id=2, name="Professional Plan", plan_type=PlanType.PROFESSIONAL)
+        now = datetime.now(timezone.utc)
+        subscription = Subscription(
             id=1,
-            status=SubscriptionStatus.ACTIVE,
+            organization_id=1,
+            plan_id=1,
+            plan=free_plan,
+            status=SubscriptionStatus.TRIALING,
+            current_period_start=now,
         )
         
+        mock_db.get.return_value = subscription
         mock_result = MagicMock()
-        mock_result.scalar_one.return_value = mock_subscription
+        mock_result.scalars.return_value.all.return_value = [free_plan, professional_plan]
         mock_db.execute.return_value = mock_result
 
-        canceled_subscription = await SubscriptionService.cancel_subscription(
+        updated = await SubscriptionService.update_subscription_with_usage_reset(
             db=mock_db,
             subscription_id=1,
-            cancel_immediately=False,
+            plan_id=2,
         )
 
-        assert canceled_subscription.status == SubscriptionStatus.CANCELED
-        assert canceled_subscription.canceled_at is not None
-        assert canceled_subscription.ended_at is None  # Runs until period end
+        # Subscription comes from the identity map, only the plan cache loads
+        mock_db.get.assert_called_once_with(Subscription, 1)
+        assert mock_db.execute.call_count == 1
+        assert updated.plan_id == 2
+        assert updated.status == SubscriptionStatus.ACTIVE
+        assert updated.downgrade_to_plan_id is None
+        mock_db.commit.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_reactivate_subscription(self, mock_db):
         """Test reactivating canceled subscription"""
-        past_date = datetime.now(timezone.utc) - timedelta(days=5)
-        mock_subscription = Subscription(
-            id=1,
-            status=SubscriptionStatus.CANCELED,
-            billing_interval=BillingInterval.MONTHLY,
-            current_period_end=past_date,  # Expired
-        )
-        
         mock_result = MagicMock()
-        mock_result.scalar_one.return_value = mock_subscription
+        mock_result.scalar_one_or_none.return_value = Subscription(id=1)
         mock_db.execute.return_value = mock_result
 
-        reactivated_subscription = await SubscriptionService.reactivate_subscription(
+        await SubscriptionService.reactivate_subscription(
             db=mock_db,
             subscription_id=1,
         )
 
-        assert reactivated_subscription.status == SubscriptionStatus.ACTIVE
-        assert reactivated_subscription.canceled_at is None
-        assert reactivated_subscription.ended_at is None
-        # Should extend period since it was expired
-        assert reactivated_subscription.current_period_end > datetime.now(timezone.utc)
+        compiled = compile_executed(mock_db)
+        sql = str(compiled)
+        assert compiled.params["status"] == SubscriptionStatus.ACTIVE
+        assert compiled.params["canceled_at"] is None
+        assert compiled.params["ended_at"] is None
+        # Period is only extended when it has already expired
+        assert "CASE WHEN (subscriptions.current_period_end <=" in sql
+        extensions = re.search(
+            r"CASE WHEN \(subscriptions\.billing_interval = 'YEARLY'\) "
+            r"THEN '([^']+)' ELSE '([^']+)' END",
+            executed_sql(mock_db),
+        )
+        assert extensions is not None
+        yearly_end, monthly_end = map(datetime.fromisoformat, extensions.groups())
+        assert yearly_end > monthly_end > datetime.now(timezone.utc)
 
     @pytest.mark.asyncio
     async def test_update_usage_count(self, mock_db):
         """Test updating subscription usage counters"""
         mock_subscription = Subscription(
             id=1,
-            current_invoice_count=5,
-            current_customer_count=10,
-            current_team_member_count=2,
+            current_invoice_count=8,
+            current_customer_count=12,
+            current_team_member_count=3,
         )
         
         mock_result = MagicMock()
-        mock_result.scalar_one.return_value = mock_subscription
+        mock_result.scalar_one_or_none.return_value = mock_subscription
         mock_db.execute.return_value = mock_result
 
         updated_subscription = await SubscriptionService.update_usage_count(
@@ -258,25 +559,26 @@ class TestSubscriptionService:
             team_member_count_delta=1,
         )
 
-        assert updated_subscription.current_invoice_count == 8
-        assert updated_subscription.current_customer_count == 12
-        assert updated_subscription.current_team_member_count == 3
+        mock_db.execute.assert_called_once()
+        mock_db.refresh.assert_not_called()
+        sql = executed_sql(mock_db)
+        assert "current_invoice_count=greatest(" in sql
+        assert "last_invoice_reset_date=greatest(" in sql
+        assert "current_customer_count=greatest(subscriptions.current_customer_count + 2, 0)" in sql
+        # Increments need no lower bound
+        assert (
+            "current_team_member_count=(subscriptions.current_team_member_count + 1)"
+        ) in sql
+        assert updated_subscription is mock_subscription
 
     @pytest.mark.asyncio
     async def test_update_usage_count_minimum_limits(self, mock_db):
         """Test usage count updates respect minimum limits"""
-        mock_subscription = Subscription(
-            id=1,
-            current_invoice_count=2,
-            current_customer_count=3,
-            current_team_member_count=2,
-        )
-        
         mock_result = MagicMock()
-        mock_result.scalar_one.return_value = mock_subscription
+        mock_result.scalar_one_or_none.return_value = Subscription(id=1)
         mock_db.execute.return_value = mock_result
 
-        updated_subscription = await SubscriptionService.update_usage_count(
+        await SubscriptionService.update_usage_count(
             db=mock_db,
             subscription_id=1,
             invoice_count_delta=-5,  # Would go negative
@@ -284,16 +586,50 @@ class TestSubscriptionService:
             team_member_count_delta=-3,  # Would go below 1
         )
 
-        assert updated_subscription.current_invoice_count == 0  # Min 0
-        assert updated_subscription.current_customer_count == 0  # Min 0
-        assert updated_subscription.current_team_member_count == 1  # Min 1 for owner
+        sql = executed_sql(mock_db)
+        assert "ELSE subscriptions.current_invoice_count END + -5, 0)" in sql  # Min 0 invoices
+        assert (
+            "current_customer_count=greatest(subscriptions.current_customer_count + -5, 0)"
+        ) in sql  # Min 0 customers
+        assert (
+            "current_team_member_count=greatest(subscriptions.current_team_member_count + -3, 1)"
+        ) in sql  # Min 1 for owner
+
+    @pytest.mark.asyncio
+    async def test_update_usage_count_without_changes(self, mock_db):
+        """Test zero deltas only read the subscription"""
+        mock_db.get.return_value = Subscription(id=1)
+
+        await SubscriptionService.update_usage_count(db=mock_db, subscription_id=1)
+
+        mock_db.get.assert_called_once_with(Subscription, 1)
+        mock_db.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_update_usage_count_missing_subscription(self, mock_db):
+        """Test an unknown subscription ID raises a ValueError"""
+        mock_result = MagicMock()
+        mock_result.scalar_one_or_none.return_value = None
+        mock_db.execute.return_value = mock_result
+
+        with pytest.raises(ValueError, match="Subscription with ID 99 not found"):
+            await SubscriptionService.update_usage_count(
+                db=mock_db, subscription_id=99, invoice_count_delta=1
+            )
+        mock_db.commit.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_create_or_update_usage_record_new(self, mock_db):
         """Test creating new usage record"""
-        # Mock no existing record
+        mock_record = UsageRecord(
+            subscription_id=1,
+            month=8,
+            year=2023,
+            invoices_created=10,
+            customers_created=5,
+        )
         mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
+        mock_result.scalar_one.return_value = mock_record
         mock_db.execute.return_value = mock_result
 
         usage_record = await SubscriptionService.create_or_update_usage_record(
@@ -305,29 +641,25 @@ class TestSubscriptionService:
             customers_created=5,
         )
 
-        # Verify new record was added
-        mock_db.add.assert_called_once()
-        assert usage_record.invoices_created == 10
-        assert usage_record.customers_created == 5
+        # Single upsert round trip, no ORM add or refresh
+        mock_db.execute.assert_called_once()
+        mock_db.add.assert_not_called()
+        mock_db.refresh.assert_not_called()
+        compiled = compile_executed(mock_db)
+        assert str(compiled).startswith("INSERT INTO usage_records")
+        assert compiled.params["invoices_created"] == 10
+        assert compiled.params["customers_created"] == 5
+        assert compiled.params["team_members_added"] == 0
+        assert usage_record is mock_record
 
     @pytest.mark.asyncio
     async def test_create_or_update_usage_record_existing(self, mock_db):
         """Test updating existing usage record"""
-        existing_record = UsageRecord(
-            subscription_id=1,
-            month=8,
-            year=2023,
-            invoices_created=5,
-            customers_created=3,
-            team_members_added=0,
-            api_calls_made=0,
-        )
-        
         mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = existing_record
+        mock_result.scalar_one.return_value = UsageRecord(subscription_id=1, month=8, year=2023)
         mock_db.execute.return_value = mock_result
 
-        usage_record = await SubscriptionService.create_or_update_usage_record(
+        await SubscriptionService.create_or_update_usage_record(
             db=mock_db,
             subscription_id=1,
             month=8,
@@ -336,10 +668,12 @@ class TestSubscriptionService:
             customers_created=2,
         )
 
-        # Should have updated existing record
-        mock_db.add.assert_not_called()
-        assert usage_record.invoices_created == 12  # 5 + 7
-        assert usage_record.customers_created == 5   # 3 + 2
+        # Existing counters are incremented by the conflicting row's values
+        sql = str(compile_executed(mock_db))
+        assert "ON CONFLICT (subscription_id, month, year) DO UPDATE SET" in sql
+        assert "invoices_created = (usage_records.invoices_created + excluded.invoices_created)" in sql
+        assert "customers_created = (usage_records.customers_created + excluded.customers_created)" in sql
+        assert "RETURNING" in sql
 
     @pytest.mark.asyncio
     async def test_get_expiring_subscriptions(self, mock_db):
@@ -359,23 +693,164 @@ class TestSubscriptionService:
         )
 
         assert len(expiring_subscriptions) == 2
+        # Plan is joined into the main query rather than loaded separately
+        assert "LEFT OUTER JOIN subscription_plans" in str(compile_executed(mock_db))
+        assert raises_on_lazy_load(mock_db)
 
     @pytest.mark.asyncio
-    async def test_reset_monthly_usage_counts(self, mock_db):
-        """Test resetting monthly usage counts"""
+    async def test_stream_expiring_subscriptions(self, mock_db):
+        """Test streaming subscriptions expiring soon in batches"""
         mock_subscriptions = [
-            Subscription(id=1, current_invoice_count=50, status=SubscriptionStatus.ACTIVE),
-            Subscription(id=2, current_invoice_count=25, status=SubscriptionStatus.TRIALING),
+            Subscription(id=1, current_period_end=datetime.now(timezone.utc) + timedelta(days=3)),
+            Subscription(id=2, current_period_end=datetime.now(timezone.utc) + timedelta(days=5)),
         ]
-        
+
+        async def scalars():
+            for subscription in mock_subscriptions:
+                yield subscription
+
         mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = mock_subscriptions
+        mock_result.scalars.side_effect = scalars
+        mock_db.stream.return_value = mock_result
+
+        streamed = [
+            subscription
+            async for subscription in SubscriptionService.stream_expiring_subscriptions(
+                db=mock_db,
+                days_ahead=7,
+                batch_size=500,
+            )
+        ]
+
+        assert streamed == mock_subscriptions
+        query = mock_db.stream.call_args.args[0]
+        assert query.get_execution_options()["yield_per"] == 500
+
+    @pytest.mark.asyncio
+    async def test_setup_paystack_plans_all_provisioned(self, mock_db):
+        """Test Paystack is not contacted when every plan already has codes"""
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
         mock_db.execute.return_value = mock_result
 
+        with patch("app.services.subscription_service.PaystackService") as paystack_cls:
+            await SubscriptionService.setup_paystack_plans(mock_db)
+
+        # Plans missing a code are filtered in SQL
+        sql = str(compile_executed(mock_db))
+        assert "subscription_plans.paystack_plan_code_monthly IS NULL" in sql
+        assert "subscription_plans.paystack_plan_code_yearly IS NULL" in sql
+        paystack_cls.assert_not_called()
+        mock_db.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_setup_paystack_plans_missing_codes(self, mock_db):
+        """Test missing Paystack plan codes are created"""
+        plan = SubscriptionPlan(
+            id=2,
+            name="Professional Plan",
+            plan_type=PlanType.PROFESSIONAL,
+            monthly_price=Decimal("25000.00"),
+            yearly_price=Decimal("250000.00"),
+            paystack_plan_code_yearly="PLN_yearly",
+        )
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = [plan]
+        mock_db.execute.return_value = mock_result
+
+        with patch("app.services.subscription_service.PaystackService") as paystack_cls:
+            create_plan = AsyncMock(return_value={"plan_code": "PLN_monthly"})
+            paystack_cls.return_value.create_subscription_plan = create_plan
+            await SubscriptionService.setup_paystack_plans(mock_db)
+
+        # Only the missing monthly plan is created
+        create_plan.assert_awaited_once_with(plan, BillingInterval.MONTHLY)
+        assert plan.paystack_plan_code_monthly == "PLN_monthly"
+        assert plan.paystack_plan_code_yearly == "PLN_yearly"
+        mock_db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_reset_monthly_usage_counts(self, mock_db):
+        """Test resetting monthly usage counts"""
         await SubscriptionService.reset_monthly_usage_counts(mock_db)
 
-        # Verify invoice counts were reset
-        assert mock_subscriptions[0].current_invoice_count == 0
-        assert mock_subscriptions[1].current_invoice_count == 0
+        # One bulk UPDATE, no rows loaded into Python
+        mock_db.execute.assert_called_once()
+        compiled = compile_executed(mock_db)
+        sql = str(compiled)
+        assert sql.startswith("UPDATE subscriptions SET current_invoice_count=")
+        assert "RETURNING" not in sql
+        assert compiled.params["current_invoice_count"] == 0
+        assert executed_sql(mock_db).endswith(
+            "WHERE subscriptions.status IN ('ACTIVE', 'TRIALING')"
+        )
         
-        mock_db.commit.assert_called_once()
\ No newline at end of file
+        mock_db.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_sync_usage_counts_from_database(self, mock_db):
+        """Test syncing usage counts with COUNT queries"""
+        subscription = Subscription(id=1, organization_id=1)
+        mock_db.get.return_value = subscription
+        counts_result = MagicMock()
+        counts_result.one.return_value = (12, 7, 0)
+        mock_db.execute.return_value = counts_result
+
+        result = await SubscriptionService.sync_usage_counts_from_database(mock_db, 1)
+
+        # All three counts run in the database in one round trip
+        mock_db.execute.assert_called_once()
+        sql = str(compile_executed(mock_db))
+        assert sql.count("(SELECT count(*)") == 3
+        for table in ("invoices", "customers", "users"):
+            assert f"FROM {table}" in sql
+
+        assert result.current_invoice_count == 12
+        assert result.current_customer_count == 7
+        assert result.current_team_member_count == 1  # Owner always counts
+        mock_db.commit.assert_called_once()
+
+
+class TestSubscriptionServiceDatabase:
+    """Test SubscriptionService against the test database"""
+
+    @pytest.mark.asyncio
+    async def test_upgrade_subscription_refreshes_loaded_plan(self, db_session):
+        """Test an upgrade replaces a plan that was already loaded"""
+        org = Organization(name="Upgrade Org", slug="upgrade-org", email="org@upgrade.com")
+        db_session.add(org)
+        await db_session.flush()
+
+        await SubscriptionService.create_default_plans(db_session)
+        professional = await SubscriptionService.get_plan_by_type(db_session, PlanType.PROFESSIONAL)
+        enterprise = await SubscriptionService.get_plan_by_type(db_session, PlanType.ENTERPRISE)
+
+        now = datetime.now(timezone.utc)
+        db_session.add(Subscription(
+            organization_id=org.id,
+            plan_id=professional.id,
+            status=SubscriptionStatus.ACTIVE,
+            billing_interval=BillingInterval.MONTHLY,
+            started_at=now,
+            current_period_start=now,
+            current_period_end=now + timedelta(days=30),
+        ))
+        await db_session.commit()
+
+        # Load the plan first, as the API does before upgrading
+        subscription = await db_session.scalar(
+            select(Subscription)
+            .options(selectinload(Subscription.plan))
+            .where(Subscription.organization_id == org.id)
+        )
+        assert subscription.plan.id == professional.id
+
+        upgraded = await SubscriptionService.upgrade_subscription(
+            db=db_session,
+            subscription_id=subscription.id,
+            new_plan_id=enterprise.id,
+        )
+
+        assert upgraded is subscription
+        assert upgraded.plan_id == enterprise.id
+        assert upgraded.plan.id == enterprise.id